@@ -0,0 +1,471 @@
+"""
+Offline benchmark klienta: místo localhost:8082, registru uzlů a GitHubu běží lokální
+falešný server a falešná JVM, takže se měří jen režie tohoto programu.
+
+    python CITU_bench.py                       # všechny benchmarky
+    python CITU_bench.py --only poll,payout --latency 20 --duration 30
+
+Výsledky se přidávají do bench_results.jsonl a porovnávají s posledním během na stejném stroji.
+"""
+import argparse
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+BENCH_RESULTS_FILE = "bench_results.jsonl"
+BENCH_REGRESSION_THRESHOLD = 0.2  # 20 % horší než minule = regrese
+BENCHMARKS = ("startup", "ui", "poll", "memory", "payout")
+
+# Směr, kterým je hodnota lepší (pro hledání regresí)
+HIGHER_IS_BETTER = ("rows_per_sec", "lines_per_sec")
+
+
+# Falešný server (REST API minera i registru uzlů)
+
+class FakeServerHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+    started = time.monotonic()
+
+    def _reply(self, body):
+        time.sleep(self.latency)
+        data = json.dumps(body).encode("utf-8") if not isinstance(body, str) else body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json" if not isinstance(body, str) else "text/plain")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _route(self, params):
+        path = urlsplit(self.path).path
+        # Globální velikost roste o blok za sekundu, ať má co dohánět sledování synchronizace
+        size = 100000 + int(time.monotonic() - self.started)
+        routes = {
+            "/": "ok",
+            "/size": size,
+            "/account": {"digitalDollarBalance": 10.5, "digitalStockBalance": 3.0, "digitalStakingBalance": 1.25},
+            "/getNodes": [f"http://127.0.0.1:{self.server.server_address[1]}"],
+            "/keys": {"pubKey": "fake-public-key", "privKey": "fake-private-key"},
+            "/resolving": "resolved",
+            "/sendCoin": "sent",
+            "/staking": "staked",
+            "/unstaking": "unstaked",
+            "/constantMining": "mining",
+            "/stopMining": "stopped",
+            "/setMinner": "ok",
+            "/server": "ok",
+            "/customDiff": "ok",
+        }
+        if path not in routes:
+            self.send_error(404)
+            return
+        self._reply(routes[path])
+
+    def do_GET(self):
+        self._route(parse_qs(urlsplit(self.path).query))
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self._route(parse_qs(self.rfile.read(length).decode("utf-8")))
+
+    def log_message(self, *args):
+        pass
+
+
+def run_fake_server(port, latency_ms):
+    FakeServerHandler.latency = latency_ms / 1000.0
+    server = ThreadingHTTPServer(("127.0.0.1", port), FakeServerHandler)
+    server.daemon_threads = True
+    print(f"listening {server.server_address[1]}", flush=True)
+    server.serve_forever()
+
+
+def run_fake_jvm(rate, seconds):
+    """Píše řádky podobné výstupu minera danou rychlostí (řádků/s)."""
+    out = sys.stdout.buffer
+    deadline = time.monotonic() + seconds
+    sent = 0
+    started = time.monotonic()
+    while time.monotonic() < deadline:
+        due = int((time.monotonic() - started) * rate)
+        lines = []
+        while sent < due:
+            sent += 1
+            if sent % 1000 == 0:
+                lines.append(b"Block found at index %d\n" % sent)
+            elif sent % 100 == 0:
+                lines.append(b"hashrate 1234.5 H/s size: %d\n" % sent)
+            else:
+                lines.append(b"2024-01-01 00:00:00 INFO miner: working on nonce %d\n" % sent)
+        if lines:
+            out.write(b"".join(lines))
+            out.flush()
+        time.sleep(0.005)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class FakeEnvironment:
+    """Spustí falešný server v samostatném procesu (jeho CPU se do měření nepočítá)
+    a připraví adresář resources s server.txt, minerAccount.txt a shortBlockchain.txt."""
+
+    def __init__(self, latency_ms):
+        self.latency_ms = latency_ms
+        self.port = free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self.process = None
+        self.resources = tempfile.TemporaryDirectory(prefix="citu_bench_")
+
+    def __enter__(self):
+        self.process = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "--fake-server", str(self.port),
+             "--latency", str(self.latency_ms)],
+            stdout=subprocess.PIPE
+        )
+        self.process.stdout.readline()  # počká, až server poslouchá
+
+        root = self.resources.name
+        files = {
+            ("server", "server.txt"): self.url,
+            ("minerAccount", "minerAccount.txt"): "fake-miner-account",
+            ("tempblockchain", "shortBlockchain.txt"): json.dumps({"size": 99990}),
+        }
+        for (folder, name), content in files.items():
+            os.makedirs(os.path.join(root, folder), exist_ok=True)
+            with open(os.path.join(root, folder, name), "w") as file:
+                file.write(content)
+
+        import CITU_engine
+        CITU_engine.set_resources_dir(root)
+        CITU_engine.NODE_REGISTRY_URL = self.url
+        return self
+
+    def __exit__(self, *exc):
+        self.process.terminate()
+        self.process.wait()
+        self.resources.cleanup()
+
+    def controller(self, log=None):
+        import CITU_engine
+        # workdir jen kvůli úložišti logu JVM, aby benchmark nepsal do aktuální složky
+        return CITU_engine.MinerController(log or (lambda text: None), api_url=self.url, workdir=self.resources.name)
+
+    def fake_jvm(self, rate, seconds):
+        return subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "--fake-jvm", str(rate), "--duration", str(seconds)],
+            stdout=subprocess.PIPE, bufsize=0
+        )
+
+
+# Jednotlivé benchmarky
+
+def bench_startup(env, args):
+    """Studený import enginu v novém procesu a čas do prvních výsledků dotazů."""
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "import CITU_engine"], check=True,
+                   cwd=os.path.dirname(os.path.abspath(__file__)))
+    import_time = time.perf_counter() - started
+
+    first = {}
+    done = threading.Event()
+    started = time.perf_counter()
+    controller = env.controller()
+
+    def listener(name, value, error):
+        if name in ("local_size", "global_size", "balances") and name not in first:
+            first[name] = time.perf_counter() - started
+            if len(first) == 3:
+                done.set()
+    controller.add_listener(listener)
+    controller.start_polling()
+    done.wait(30)
+    controller.shutdown()
+    result = {
+        "import_s": import_time,
+        "first_poll_s": max(first.values()) if first else None,
+    }
+    result.update(measure_first_frame(env))
+    return result
+
+
+def measure_first_frame(env):
+    """Čas od spuštění procesu s GUI do prvního vykreslení okna; bez displeje se přeskočí."""
+    started = time.perf_counter()
+    process = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--gui-startup"],
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, cwd=env.resources.name)
+    line = process.stdout.readline()
+    first_frame = time.perf_counter() - started
+    _, stderr = process.communicate(timeout=30)
+    if not line:
+        # Např. chybějící customtkinter - skutečná chyba, ne "Tk není k dispozici"
+        lines = stderr.strip().splitlines()
+        return {"gui_error": lines[-1] if lines else f"exit code {process.returncode}"}
+    result = json.loads(line)
+    if "skipped" in result:
+        return {"gui_skipped": result["skipped"]}
+    return {"first_frame_s": first_frame, "widget_build_s": result["widget_build_s"]}
+
+
+def run_gui_startup():
+    """Podproces pro measure_first_frame: postaví okno, po prvním vykreslení vypíše výsledek a skončí."""
+    import tkinter as tk
+    import CITU_engine
+    CITU_engine.set_resources_dir(os.getcwd())
+    # Měří se jen GUI - JVM, dotazy ani kontrola aktualizací se nespouští
+    CITU_engine.MinerController.start = lambda self: None
+    from CITU_gui import Application
+    try:
+        app = Application()
+    except tk.TclError as e:
+        print(json.dumps({"skipped": f"no display: {e}"}), flush=True)
+        return 0
+
+    def first_frame():
+        phase = app.startup.phases["widget build"]
+        print(json.dumps({"widget_build_s": phase[1] - phase[0]}), flush=True)
+        app.quit()
+    # Zaregistrováno až po značce "first frame" z Application, takže proběhne po ní
+    app.after_idle(first_frame)
+    app.mainloop()
+    app.on_close()
+    return 0
+
+
+def bench_ui(env, args):
+    """Zpoždění smyčky Tk při záplavě logu z falešné JVM (přes UiDispatcher a ConsoleBuffer)."""
+    try:
+        import tkinter as tk
+    except ImportError as e:
+        return {"skipped": f"Tk not available: {e}"}
+    # Chybějící závislost GUI (customtkinter) je chyba, ne důvod benchmark přeskočit
+    from CITU_engine import LogPump
+    from CITU_gui import ConsoleBuffer, UiDispatcher
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        return {"skipped": f"no display: {e}"}
+    root.withdraw()
+    text = tk.Text(root)
+    console = ConsoleBuffer(text, log_file=None)
+    dispatcher = UiDispatcher(root, console.write)
+
+    process = env.fake_jvm(args.log_rate, args.duration)
+    pump = LogPump(process.stdout, dispatcher.put)
+    threading.Thread(target=pump.run, daemon=True).start()
+
+    # Tik každých 10 ms; měří se, o kolik se zpozdí oproti plánu
+    delays = []
+    interval = 0.010
+    deadline = time.perf_counter() + args.duration
+
+    def tick(expected):
+        now = time.perf_counter()
+        delays.append(max(now - expected, 0))
+        if now < deadline:
+            root.after(int(interval * 1000), tick, now + interval)
+        else:
+            root.quit()
+    root.after(int(interval * 1000), tick, time.perf_counter() + interval)
+    root.mainloop()
+    process.kill()
+    console.close()
+    root.destroy()
+
+    delays.sort()
+    stats = pump.stats()
+    return {
+        "tick_delay_p50_ms": delays[len(delays) // 2] * 1000,
+        "tick_delay_p99_ms": delays[int(len(delays) * 0.99)] * 1000,
+        "tick_delay_max_ms": delays[-1] * 1000,
+        "lines_per_sec": stats["lines"] / args.duration,
+    }
+
+
+def bench_poll(env, args):
+    """CPU čas tohoto procesu na jeden periodický dotaz (server běží v jiném procesu)."""
+    import CITU_engine
+    controller = env.controller()
+    intervals = dict(CITU_engine.POLL_INTERVALS)
+    # Zrychlené intervaly, aby se za krátkou dobu nasbíralo dost vzorků
+    for name in intervals:
+        CITU_engine.POLL_INTERVALS[name] = 0.2
+    polls = []
+    controller.add_listener(lambda name, value, error: polls.append(name))
+    cpu_started = time.process_time()
+    started = time.perf_counter()
+    controller.start_polling()
+    time.sleep(args.duration)
+    controller.shutdown()
+    cpu = time.process_time() - cpu_started
+    elapsed = time.perf_counter() - started
+    CITU_engine.POLL_INTERVALS.update(intervals)
+    return {
+        "polls": len(polls),
+        "cpu_ms_per_poll": cpu * 1000 / max(len(polls), 1),
+        "cpu_percent": cpu * 100 / elapsed,
+    }
+
+
+def bench_memory(env, args):
+    """Růst paměti (tracemalloc) při běžícím dotazování a proudu logu, přepočtený na hodinu."""
+    import CITU_engine
+    tracemalloc.start()
+    controller = env.controller()
+    process = env.fake_jvm(args.log_rate, args.memory_duration)
+    controller.log_pump = CITU_engine.LogPump(process.stdout, controller._on_jvm_output)
+    threading.Thread(target=controller.log_pump.run, daemon=True).start()
+    controller.start_polling()
+
+    samples = []
+    started = time.monotonic()
+    while time.monotonic() - started < args.memory_duration:
+        samples.append((time.monotonic() - started, tracemalloc.get_traced_memory()[0]))
+        time.sleep(max(args.memory_duration / 20, 0.5))
+    controller.shutdown()
+    process.kill()
+    tracemalloc.stop()
+
+    # Sklon od poloviny běhu (první polovina je zahřátí, plnění cache a front)
+    half = samples[len(samples) // 2:]
+    slope = (half[-1][1] - half[0][1]) / max(half[-1][0] - half[0][0], 1e-6)
+    return {
+        "traced_mb": samples[-1][1] / 1e6,
+        "growth_mb_per_hour": slope * 3600 / 1e6,
+    }
+
+
+def bench_payout(env, args):
+    """Propustnost hromadné výplaty proti falešnému /sendCoin."""
+    controller = env.controller()
+    with tempfile.TemporaryDirectory(prefix="citu_payout_") as folder:
+        path = os.path.join(folder, "payout.csv")
+        with open(path, "w") as file:
+            file.write("recipient,dollar,stock,reward\n")
+            for index in range(args.payout_rows):
+                file.write(f"recipient-{index},1.25,0,0\n")
+        started = time.perf_counter()
+        summary = controller.pay_out(path, "fake-sender", "fake-password",
+                                     concurrency=args.concurrency, rate=args.rate)
+        elapsed = time.perf_counter() - started
+    controller.shutdown()
+    return {
+        "rows": args.payout_rows,
+        "sent": summary.get("sent", 0),
+        "rows_per_sec": summary.get("sent", 0) / elapsed,
+    }
+
+
+# Ukládání a porovnání výsledků
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def load_previous(path, host, latency_ms):
+    """Poslední běh na stejném stroji se stejnou latencí falešného serveru."""
+    previous = None
+    try:
+        with open(path, "r") as file:
+            for line in file:
+                try:
+                    run = json.loads(line)
+                except ValueError:
+                    continue
+                if run.get("host") == host and run.get("latency_ms") == latency_ms:
+                    previous = run
+    except OSError:
+        pass
+    return previous
+
+
+def find_regressions(previous, current, threshold=BENCH_REGRESSION_THRESHOLD):
+    regressions = []
+    for bench, values in current.items():
+        for name, value in values.items():
+            old = previous.get(bench, {}).get(name)
+            if not isinstance(value, (int, float)) or not isinstance(old, (int, float)) or not old:
+                continue
+            change = (value - old) / abs(old)
+            if name in HIGHER_IS_BETTER:
+                change = -change
+            if change > threshold:
+                regressions.append(f"{bench}.{name}: {old:.4g} -> {value:.4g} ({change * 100:+.0f}% worse)")
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the CITU client")
+    parser.add_argument("--only", help=f"comma separated subset of: {', '.join(BENCHMARKS)}")
+    parser.add_argument("--latency", type=float, default=5, help="fake server latency in ms (default 5)")
+    parser.add_argument("--duration", type=float, default=10, help="seconds per timed benchmark (default 10)")
+    parser.add_argument("--memory-duration", type=float, default=60,
+                        help="seconds for the memory benchmark, use hours for soak runs (default 60)")
+    parser.add_argument("--log-rate", type=int, default=5000, help="fake JVM log lines per second (default 5000)")
+    parser.add_argument("--payout-rows", type=int, default=200, help="rows in the payout benchmark (default 200)")
+    parser.add_argument("--concurrency", type=int, default=4, help="payout concurrency (default 4)")
+    parser.add_argument("--rate", type=float, default=0, help="payout rate limit per second (default 0 = none)")
+    parser.add_argument("--results", default=BENCH_RESULTS_FILE, help="results file (JSON lines)")
+    parser.add_argument("--check", action="store_true", help="exit with status 1 on regressions")
+    # Pomocné režimy, které benchmark spouští jako podprocesy
+    parser.add_argument("--fake-server", type=int, metavar="PORT", help=argparse.SUPPRESS)
+    parser.add_argument("--fake-jvm", type=int, metavar="RATE", help=argparse.SUPPRESS)
+    parser.add_argument("--gui-startup", action="store_true", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.fake_server:
+        return run_fake_server(args.fake_server, args.latency)
+    if args.fake_jvm:
+        return run_fake_jvm(args.fake_jvm, args.duration)
+    if args.gui_startup:
+        return run_gui_startup()
+
+    selected = args.only.split(",") if args.only else list(BENCHMARKS)
+    benchmarks = {"startup": bench_startup, "ui": bench_ui, "poll": bench_poll,
+                  "memory": bench_memory, "payout": bench_payout}
+    results = {}
+    with FakeEnvironment(args.latency) as env:
+        for name in selected:
+            print(f"Running {name}...", flush=True)
+            try:
+                results[name] = benchmarks[name](env, args)
+            except Exception as e:
+                results[name] = {"error": str(e)}
+            print(f"  {json.dumps(results[name])}", flush=True)
+
+    host = platform.node()
+    previous = load_previous(args.results, host, args.latency)
+    run = {"time": time.time(), "commit": git_commit(), "host": host, "python": platform.python_version(),
+           "latency_ms": args.latency, "results": results}
+    with open(args.results, "a") as file:
+        file.write(json.dumps(run) + "\n")
+
+    regressions = find_regressions(previous["results"], results) if previous else []
+    if previous:
+        print(f"Compared with {previous.get('commit') or 'previous run'}: "
+              f"{len(regressions)} regression(s)")
+    for line in regressions:
+        print(f"  REGRESSION {line}")
+    return 1 if regressions and args.check else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
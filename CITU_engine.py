@@ -0,0 +1,3352 @@
+import collections
+import csv
+import ctypes
+import functools
+import getpass
+import hashlib
+import heapq
+import itertools
+import json
+import locale
+import logging
+import os
+import queue
+import random
+import re
+import signal
+import socket
+import sys
+import subprocess
+import threading
+import time
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from urllib.parse import urlencode, urlsplit
+
+
+# Kořeny, ve kterých se hledají instalace Javy (každá podsložka je kandidát na JAVA_HOME)
+if os.name == "nt":
+    JAVA_SEARCH_ROOTS = [
+        "C:\\Program Files\\Java",
+        "C:\\Program Files (x86)\\Java",
+        "C:\\Program Files\\Eclipse Adoptium",
+        "C:\\Program Files\\Microsoft",
+        "C:\\Program Files\\Zulu",
+        "C:\\Program Files\\Amazon Corretto",
+        os.path.join(os.path.expanduser("~"), ".jdks"),
+    ]
+else:
+    JAVA_SEARCH_ROOTS = [
+        "/usr/lib/jvm",
+        "/usr/java",
+        "/opt/java",
+        "/Library/Java/JavaVirtualMachines",
+        os.path.join(os.path.expanduser("~"), ".sdkman", "candidates", "java"),
+        os.path.join(os.path.expanduser("~"), ".jdks"),
+    ]
+MIN_JAVA_VERSION = 8
+JAVA_CACHE_FILE = "java_home.json"
+JAVA_PROBE_WORKERS = 8
+
+
+def java_executable(java_home):
+    return os.path.join(java_home, "bin", "java.exe" if os.name == "nt" else "java")
+
+
+def parse_java_version(text):
+    """'17.0.2' -> (17, 0, 2), '1.8.0_292' -> (8, 0, 292), 'jdk-21' -> (21,)"""
+    match = re.search(r'(\d+(?:[._]\d+)*)', text)
+    if not match:
+        return None
+    parts = [int(part) for part in re.split(r'[._]', match.group(1))]
+    if parts[0] == 1 and len(parts) > 1:
+        parts = parts[1:]  # staré číslování 1.x
+    return tuple(parts)
+
+
+def probe_java_home(path):
+    """Vrací {"java_home", "java_exe", "version"} pro platnou instalaci, jinak None."""
+    # macOS: .../jdk-17.jdk/Contents/Home
+    if os.path.isdir(os.path.join(path, "Contents", "Home")):
+        path = os.path.join(path, "Contents", "Home")
+    java_exe = java_executable(path)
+    if not os.path.isfile(java_exe):
+        return None
+    version = None
+    try:
+        with open(os.path.join(path, "release"), "r") as file:
+            match = re.search(r'^JAVA_VERSION="([^"]+)"', file.read(), re.MULTILINE)
+        if match:
+            version = parse_java_version(match.group(1))
+    except OSError:
+        pass
+    if version is None:
+        # Bez souboru release zbývá jen název složky (jdk-17.0.2, java-17-openjdk-amd64)
+        version = parse_java_version(os.path.basename(os.path.realpath(path)))
+    return {"java_home": path, "java_exe": java_exe, "version": version or (0,)}
+
+
+def discover_java(roots=None, max_workers=JAVA_PROBE_WORKERS):
+    """Prohledá kořeny paralelně a vrátí nalezené instalace seřazené od nejnovější."""
+    candidates = []
+    for root in roots or JAVA_SEARCH_ROOTS:
+        try:
+            candidates += [os.path.join(root, name) for name in os.listdir(root)]
+        except OSError:
+            continue
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        found = [result for result in executor.map(probe_java_home, candidates) if result]
+    return sorted(found, key=lambda result: result["version"], reverse=True)
+
+
+def load_cached_java(path=JAVA_CACHE_FILE):
+    """Vrátí uloženou instalaci, pokud java na dané cestě pořád existuje a nezměnila se."""
+    try:
+        with open(path, "r") as file:
+            cached = json.load(file)
+        if os.path.getmtime(cached["java_exe"]) == cached["mtime"]:
+            cached["version"] = tuple(cached["version"])
+            return cached
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+
+def save_cached_java(result, path=JAVA_CACHE_FILE):
+    data = dict(result, mtime=os.path.getmtime(result["java_exe"]))
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "w") as file:
+            json.dump(data, file)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def set_java_home(log, min_version=MIN_JAVA_VERSION, cache_path=JAVA_CACHE_FILE):
+    # Kontrola, zda je JAVA_HOME již nastavena a obsahuje spustitelnou javu
+    java_home = os.environ.get('JAVA_HOME')
+    if java_home and os.path.isfile(java_executable(java_home)):
+        log(f"JAVA_HOME is already set to: {java_home}")
+        return java_home
+
+    # Výsledek předchozího hledání - start bez prohledávání disku
+    cached = load_cached_java(cache_path)
+    if cached and cached["version"] >= (min_version,):
+        os.environ['JAVA_HOME'] = cached["java_home"]
+        log(f"Using cached JDK: {cached['java_home']}")
+        return cached["java_home"]
+
+    log("Searching for Java installations...")
+    found = [result for result in discover_java() if result["version"] >= (min_version,)]
+
+    # Pokud nejsou nalezeny žádné verze
+    if not found:
+        log(f"Error: No Java {min_version}+ installations found.")
+        return None
+
+    # Automaticky vybere nejnovější verzi
+    best = found[0]
+    java_home = best["java_home"]
+    log(f"Detected latest JDK version: {'.'.join(map(str, best['version']))} at {java_home}")
+    save_cached_java(best, cache_path)
+
+    # Nastavení JAVA_HOME v aktuálním procesu
+    os.environ['JAVA_HOME'] = java_home
+    log(f"JAVA_HOME temporarily set to: {java_home}")
+
+    # Trvalé nastavení pomocí setx jen na Windows a jen po skutečném hledání (ne při každém startu)
+    if os.name == "nt":
+        try:
+            subprocess.run(['setx', 'JAVA_HOME', java_home], check=True, stdout=subprocess.DEVNULL)
+            log(f"JAVA_HOME successfully added to system environment variables: {java_home}")
+        except (OSError, subprocess.CalledProcessError) as e:
+            log(f"Failed to add JAVA_HOME to system environment variables. Error: {e}")
+
+    return java_home
+
+
+LOCAL_API_URL = "http://localhost:8082"
+NODE_REGISTRY_URL = "http://194.87.236.238:82"
+
+# Nastavení pro jednotlivé endpointy: timeout (connect, read), počet opakování a základ backoffu v sekundách.
+# Opakují se jen idempotentní volání, transakce (sendCoin, staking...) se nikdy neposílají dvakrát.
+ENDPOINT_POLICIES = {
+    "default": {"timeout": (3, 10), "retries": 0, "backoff": 0.5},
+    "/size": {"timeout": (3, 5), "retries": 2, "backoff": 0.5},
+    "/account": {"timeout": (3, 10), "retries": 2, "backoff": 0.5},
+    "/getNodes": {"timeout": (3, 10), "retries": 2, "backoff": 1.0},
+    "/keys": {"timeout": (3, 10), "retries": 1, "backoff": 0.5},
+    "/resolving": {"timeout": (3, 10), "retries": 0, "backoff": 0.5},
+    "/setMinner": {"timeout": (3, 10), "retries": 1, "backoff": 0.5},
+    "/server": {"timeout": (3, 10), "retries": 1, "backoff": 0.5},
+    "/customDiff": {"timeout": (3, 10), "retries": 1, "backoff": 0.5},
+    "/constantMining": {"timeout": (3, 10), "retries": 0, "backoff": 0.5},
+    "/stopMining": {"timeout": (3, 10), "retries": 0, "backoff": 0.5},
+    "/sendCoin": {"timeout": (3, 30), "retries": 0, "backoff": 0.5},
+    "/staking": {"timeout": (3, 30), "retries": 0, "backoff": 0.5},
+    "/unstaking": {"timeout": (3, 30), "retries": 0, "backoff": 0.5},
+}
+
+RETRY_STATUS_CODES = (502, 503, 504)
+
+
+# Hranice košů histogramu latence v sekundách (logaritmicky od 0,1 ms do ~100 s)
+LATENCY_BUCKETS = [0.0001 * 1.25 ** i for i in range(63)]
+PROFILER_INTERVAL = 0.01  # s
+
+
+class LatencyHistogram:
+    """Histogram latencí s pevnými logaritmickými koši (paměť i čas nezávislé na počtu vzorků)."""
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        low, high = 0, len(LATENCY_BUCKETS)
+        while low < high:
+            middle = (low + high) // 2
+            if LATENCY_BUCKETS[middle] < seconds:
+                low = middle + 1
+            else:
+                high = middle
+        self.counts[low] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, p):
+        if not self.count:
+            return 0.0
+        target = self.count * p / 100.0
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= target:
+                if index >= len(LATENCY_BUCKETS):
+                    return self.max
+                # Lineární interpolace uvnitř koše
+                lower = LATENCY_BUCKETS[index - 1] if index else 0.0
+                value = lower + (LATENCY_BUCKETS[index] - lower) * (target - seen) / count
+                return min(value, self.max)
+            seen += count
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean_ms": self.total * 1000 / self.count if self.count else 0.0,
+            "p50_ms": self.percentile(50) * 1000,
+            "p95_ms": self.percentile(95) * 1000,
+            "p99_ms": self.percentile(99) * 1000,
+            "max_ms": self.max * 1000,
+        }
+
+
+class Diagnostics:
+    """
+    Společné měření pro celou aplikaci: latence REST volání, čtení souborů a callbacků Tk
+    (druh, jméno) -> histogram, počty chyb podle typu a další zdroje (pumpa logu, HTTP pool).
+    """
+
+    def __init__(self):
+        self.histograms = {}
+        self.errors = collections.Counter()
+        self.sources = {}
+        self.lock = threading.Lock()
+        self.started = time.time()
+
+    def observe(self, kind, name, seconds, error=None):
+        with self.lock:
+            histogram = self.histograms.get((kind, name))
+            if histogram is None:
+                histogram = self.histograms[(kind, name)] = LatencyHistogram()
+            histogram.add(seconds)
+            if error is not None:
+                self.errors[(kind, name, error)] += 1
+
+    def timed(self, kind, name):
+        return _Timed(self, kind, name)
+
+    def add_source(self, name, func):
+        """func() vrací slovník hodnot, který se přečte až při snapshotu."""
+        self.sources[name] = func
+
+    def remove_source(self, name):
+        self.sources.pop(name, None)
+
+    def snapshot(self):
+        with self.lock:
+            latency = {f"{kind} {name}": histogram.summary()
+                       for (kind, name), histogram in sorted(self.histograms.items())}
+            errors = {f"{kind} {name}: {error}": count for (kind, name, error), count in sorted(self.errors.items())}
+        sources = {}
+        for name, func in list(self.sources.items()):
+            try:
+                sources[name] = func()
+            except Exception as e:
+                sources[name] = {"error": str(e)}
+        return {"uptime_s": time.time() - self.started, "latency": latency, "errors": errors, "sources": sources}
+
+    def export(self, path, profiler=None):
+        data = self.snapshot()
+        if profiler is not None:
+            data["profile"] = profiler.top(50)
+        with open(path, "w") as file:
+            json.dump(data, file, indent=2)
+
+    def reset(self):
+        with self.lock:
+            self.histograms.clear()
+            self.errors.clear()
+            self.started = time.time()
+
+
+class _Timed:
+    def __init__(self, diagnostics, kind, name):
+        self.diagnostics = diagnostics
+        self.kind = kind
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        error = exc_type.__name__ if exc_type is not None else None
+        self.diagnostics.observe(self.kind, self.name, time.perf_counter() - self.started, error)
+        return False
+
+
+def format_diagnostics(snapshot):
+    lines = [f"{'operation':<40} {'count':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}"]
+    for name, h in snapshot["latency"].items():
+        lines.append(f"{name[:40]:<40} {h['count']:>7} {h['p50_ms']:>9.1f} {h['p95_ms']:>9.1f} "
+                     f"{h['p99_ms']:>9.1f} {h['max_ms']:>9.1f}")
+    if snapshot["errors"]:
+        lines += ["", "Errors:"] + [f"  {name}: {count}" for name, count in snapshot["errors"].items()]
+    for name, values in snapshot["sources"].items():
+        lines += ["", f"{name}:"] + [
+            f"  {key}: {value:.1f}" if isinstance(value, float) else f"  {key}: {value}"
+            for key, value in values.items() if not isinstance(value, dict)
+        ]
+    return "\n".join(lines)
+
+
+class SamplingProfiler:
+    """
+    Volitelný vzorkovací profiler: každých PROFILER_INTERVAL s zaznamená, kde právě stojí
+    každé vlákno (kromě svého). Zapíná se jen na vyžádání, jinak nic nestojí.
+    """
+
+    def __init__(self, interval=PROFILER_INTERVAL):
+        self.interval = interval
+        self.samples = collections.Counter()
+        self.total = 0
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    @property
+    def running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self.samples.clear()
+        self.total = 0
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, daemon=True, name="profiler")
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def _run(self):
+        own = threading.get_ident()
+        names = {}
+        while not self.stop_event.wait(self.interval):
+            for thread in threading.enumerate():
+                names[thread.ident] = thread.name
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                code = frame.f_code
+                location = f"{os.path.basename(code.co_filename)}:{frame.f_lineno} {code.co_name}"
+                self.samples[(names.get(ident, ident), location)] += 1
+            self.total += 1
+
+    def top(self, count=20):
+        return [
+            {"thread": thread, "location": location, "samples": samples,
+             "percent": samples * 100 / self.total if self.total else 0.0}
+            for (thread, location), samples in self.samples.most_common(count)
+        ]
+
+
+# Jedna instance pro celou aplikaci
+diagnostics = Diagnostics()
+
+
+class HttpClient:
+    """
+    Sdílený HTTP klient s keep-alive spojeními.
+    Každý host (localhost:8082, vzdálený server, registr uzlů, GitHub) má vlastní pool spojení,
+    timeouty a opakování se řídí podle ENDPOINT_POLICIES.
+    """
+
+    def __init__(self, policies=None, pool_connections=16, pool_maxsize=8):
+        self.policies = dict(ENDPOINT_POLICIES)
+        if policies:
+            self.policies.update(policies)
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.session = None
+        self.adapter = None
+        self.session_lock = threading.Lock()
+        self.stats_lock = threading.Lock()
+        self.retries = 0
+        self.errors = 0
+
+    def _session(self):
+        # requests se importuje až při prvním dotazu (ten běží mimo hlavní vlákno), okno tak naběhne dřív
+        with self.session_lock:
+            if self.session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                self.adapter = HTTPAdapter(
+                    pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize, max_retries=0
+                )
+                self.session = requests.Session()
+                self.session.mount("http://", self.adapter)
+                self.session.mount("https://", self.adapter)
+            return self.session
+
+    def policy_for(self, url):
+        path = urlsplit(url).path.rstrip("/") or "/"
+        return self.policies.get(path, self.policies["default"])
+
+    def request(self, method, url, **kwargs):
+        policy = self.policy_for(url)
+        kwargs.setdefault("timeout", policy["timeout"])
+        retries = kwargs.pop("retries", policy["retries"])
+        endpoint = urlsplit(url).path.rstrip("/") or "/"
+        session = self._session()
+        import requests
+
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                response = session.request(method, url, **kwargs)
+                error = f"HTTP {response.status_code}" if response.status_code >= 400 else None
+                diagnostics.observe("http", endpoint, time.perf_counter() - started, error)
+                if response.status_code not in RETRY_STATUS_CODES or attempt >= retries:
+                    return response
+                response.close()
+            except (requests.ConnectionError, requests.Timeout) as e:
+                diagnostics.observe("http", endpoint, time.perf_counter() - started, type(e).__name__)
+                if attempt >= retries:
+                    with self.stats_lock:
+                        self.errors += 1
+                    raise
+            with self.stats_lock:
+                self.retries += 1
+            time.sleep(policy["backoff"] * (2 ** attempt))
+            attempt += 1
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def stats(self):
+        """Vrátí počty otevřených a znovu použitých spojení pro každý host."""
+        hosts = {}
+        pools = self.adapter.poolmanager.pools if self.adapter is not None else {}
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            host = f"{pool.scheme}://{pool.host}:{pool.port}"
+            entry = hosts.setdefault(host, {"opened": 0, "requests": 0, "reused": 0})
+            entry["opened"] += pool.num_connections
+            entry["requests"] += pool.num_requests
+            entry["reused"] += max(pool.num_requests - pool.num_connections, 0)
+
+        with self.stats_lock:
+            return {
+                "hosts": hosts,
+                "opened": sum(h["opened"] for h in hosts.values()),
+                "reused": sum(h["reused"] for h in hosts.values()),
+                "retries": self.retries,
+                "errors": self.errors,
+            }
+
+    def close(self):
+        with self.session_lock:
+            if self.session is not None:
+                self.session.close()
+                self.session = None
+                self.adapter = None
+
+
+# Jeden klient pro celou aplikaci
+http_client = HttpClient()
+diagnostics.add_source("http pool", lambda: {
+    key: value for key, value in http_client.stats().items() if key != "hosts"
+})
+diagnostics.add_source("response cache", lambda: response_cache.stats())
+
+# Seznam uzlů se ukládá na disk, aby se okno po restartu vykreslilo hned
+NODE_CACHE_FILE = "nodes_cache.json"
+NODE_CACHE_TTL = 3600  # sekund
+
+
+def load_cached_nodes(path=NODE_CACHE_FILE, ttl=NODE_CACHE_TTL):
+    """
+    Načte seznam uzlů z disku. Vrací (nodes, fresh), kde fresh říká, zda je cache mladší než TTL.
+    """
+    try:
+        with open(path, "r") as file:
+            data = json.load(file)
+        nodes = data.get("nodes", [])
+        if not isinstance(nodes, list):
+            return [], False
+        fresh = time.time() - data.get("saved_at", 0) < ttl
+        return nodes, fresh
+    except Exception:
+        return [], False
+
+
+def save_cached_nodes(nodes, path=NODE_CACHE_FILE):
+    try:
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as file:
+            json.dump({"saved_at": time.time(), "nodes": nodes}, file)
+        os.replace(tmp_path, path)
+    except Exception:
+        pass
+
+
+# Uzel se považuje za synchronizovaný, pokud nezaostává o víc bloků než MAX_SYNC_LAG
+MAX_SYNC_LAG = 2
+PROBE_TIMEOUT = (2, 4)
+PROBE_WORKERS = 16
+
+
+def probe_node(node, timeout=PROBE_TIMEOUT):
+    """Změří odezvu uzlu a jeho výšku blockchainu přes endpoint /size."""
+    result = {"node": node, "latency": None, "size": None, "lag": None, "error": None}
+    started = time.perf_counter()
+    try:
+        response = http_client.get(f"{node.rstrip('/')}/size", timeout=timeout, retries=0)
+        result["latency"] = time.perf_counter() - started
+        if response.status_code != 200:
+            result["error"] = f"HTTP Error: {response.status_code}"
+        else:
+            result["size"] = int(response.json())
+    except Exception as e:
+        result["error"] = str(e)
+    return result
+
+
+def probe_nodes(nodes, max_workers=PROBE_WORKERS):
+    """
+    Otestuje všechny uzly paralelně a vrátí je seřazené:
+    nejdřív synchronizované podle odezvy, pak zaostávající, nakonec nedostupné.
+    """
+    if not nodes:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(nodes))) as pool:
+        results = list(pool.map(probe_node, nodes))
+
+    sizes = [r["size"] for r in results if r["size"] is not None]
+    best = max(sizes) if sizes else None
+    for r in results:
+        if r["size"] is not None:
+            r["lag"] = best - r["size"]
+
+    def rank(r):
+        if r["size"] is None:
+            return (2, 0, 0)
+        return (0 if r["lag"] <= MAX_SYNC_LAG else 1, r["latency"], r["lag"])
+
+    return sorted(results, key=rank)
+
+
+def pick_fastest_in_sync(results, max_lag=MAX_SYNC_LAG):
+    for r in results:
+        if r["size"] is not None and r["lag"] <= max_lag:
+            return r
+    return None
+
+
+def format_probe_result(r):
+    if r["size"] is None:
+        return f"{r['node']}: unreachable ({r['error']})"
+    return f"{r['node']}: {r['latency'] * 1000:.0f} ms, size {r['size']}, lag {r['lag']}"
+
+
+# Kořen souborů, které zapisuje miner (lze přepsat proměnnou CITU_RESOURCES_DIR nebo --resources-dir)
+DEFAULT_RESOURCES_DIR = r"C:\\resources" if os.name == "nt" else os.path.join(os.path.expanduser("~"), "resources")
+RESOURCES_DIR = os.environ.get("CITU_RESOURCES_DIR", DEFAULT_RESOURCES_DIR)
+SHORT_BLOCKCHAIN_FILE = os.path.join("tempblockchain", "shortBlockchain.txt")
+SERVER_FILE = os.path.join("server", "server.txt")
+MINER_ACCOUNT_FILE = os.path.join("minerAccount", "minerAccount.txt")
+
+
+def set_resources_dir(path):
+    global RESOURCES_DIR
+    RESOURCES_DIR = path
+
+
+def resource_path(name):
+    return os.path.join(RESOURCES_DIR, name)
+
+
+class FileStateCache:
+    """
+    Drží naparsovaný obsah souborů v paměti. Soubor se znovu čte a parsuje jen tehdy,
+    když se změnil jeho mtime nebo velikost; ostatní volání dostanou hodnotu z paměti.
+    """
+
+    def __init__(self):
+        self.entries = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.parses = 0
+
+    def get(self, path, parser):
+        stat = os.stat(path)  # FileNotFoundError se předá volajícímu jako dřív open()
+        signature = (stat.st_mtime_ns, stat.st_size)
+        key = (path, parser)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self.hits += 1
+                return entry[1]
+
+        with diagnostics.timed("file", os.path.basename(path)):
+            with open(path, "r") as file:
+                value = parser(file)
+        with self.lock:
+            self.entries[key] = (signature, value)
+            self.parses += 1
+        return value
+
+    def stats(self):
+        with self.lock:
+            return {"hits": self.hits, "parses": self.parses, "files": len(self.entries)}
+
+
+file_cache = FileStateCache()
+
+# Intervaly periodických úloh v sekundách a náhodný rozptyl (podíl intervalu),
+# aby se dotazy z mnoha strojů nesešly ve stejný okamžik
+POLL_INTERVALS = {
+    "local_size": 10,
+    "global_size": 10,
+    "balances": 60,
+    "account_file": 30,
+    "auto_server": 600,
+    "metrics": 2,
+}
+POLL_JITTER = 0.1
+
+
+def _parse_local_size(file):
+    return json.load(file).get("size", "N/A")
+
+
+def _parse_stripped(file):
+    return file.read().strip()
+
+
+def read_local_size():
+    return file_cache.get(resource_path(SHORT_BLOCKCHAIN_FILE), _parse_local_size)
+
+
+def read_server_address():
+    return file_cache.get(resource_path(SERVER_FILE), _parse_stripped)
+
+
+def read_miner_account():
+    return file_cache.get(resource_path(MINER_ACCOUNT_FILE), _parse_stripped)
+
+
+# Cache odpovědí vzdálených serverů: "ttl" = jak dlouho je odpověď čerstvá,
+# "stale" = jak dlouho po vypršení se ještě vrací stará hodnota a na pozadí se obnovuje
+RESPONSE_CACHE_POLICIES = {
+    "/size": {"ttl": 5, "stale": 30},
+    "/account": {"ttl": 15, "stale": 120},
+}
+
+
+class ResponseCache:
+    """
+    Cache s TTL, stale-while-revalidate a single-flight: souběžné dotazy na stejný klíč
+    sdílí jediné volání, chyby se necachují a předají se všem čekajícím.
+    """
+
+    def __init__(self, policies=None):
+        self.policies = dict(RESPONSE_CACHE_POLICIES)
+        if policies:
+            self.policies.update(policies)
+        self.entries = {}
+        self.in_flight = {}
+        self.lock = threading.Lock()
+        self.counts = collections.Counter()
+
+    def get(self, endpoint, key, fetch):
+        policy = self.policies[endpoint]
+        key = (endpoint, key)
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                age = now - entry[0]
+                if age < policy["ttl"]:
+                    self.counts["hits"] += 1
+                    return entry[1]
+                if age < policy["ttl"] + policy["stale"]:
+                    self.counts["stale_hits"] += 1
+                    if key not in self.in_flight:
+                        self.in_flight[key] = Future()
+                        threading.Thread(target=self._revalidate, args=(key, fetch), daemon=True).start()
+                    return entry[1]
+            future = self.in_flight.get(key)
+            if future is None:
+                self.counts["misses"] += 1
+                self.in_flight[key] = Future()
+            else:
+                self.counts["coalesced"] += 1
+        if future is not None:
+            return future.result()
+        return self._fetch(key, fetch)
+
+    def _revalidate(self, key, fetch):
+        try:
+            self._fetch(key, fetch)
+        except Exception:
+            pass  # stará hodnota zůstává, chyba je započtená v "errors"
+
+    def _fetch(self, key, fetch):
+        with self.lock:
+            future = self.in_flight[key]
+        try:
+            value = fetch()
+        except Exception as e:
+            with self.lock:
+                self.counts["errors"] += 1
+                del self.in_flight[key]
+            future.set_exception(e)
+            raise
+        with self.lock:
+            self.entries[key] = (time.monotonic(), value)
+            del self.in_flight[key]
+        future.set_result(value)
+        return value
+
+    def invalidate(self, endpoint=None):
+        """Zahodí uložené odpovědi (všechny, nebo jednoho endpointu), další get() se zeptá znovu."""
+        with self.lock:
+            if endpoint is None:
+                self.entries.clear()
+            else:
+                self.entries = {key: entry for key, entry in self.entries.items() if key[0] != endpoint}
+
+    def stats(self):
+        with self.lock:
+            counts = dict(self.counts)
+            counts["in_flight"] = len(self.in_flight)
+            counts["entries"] = len(self.entries)
+        lookups = sum(counts.get(name, 0) for name in ("hits", "stale_hits", "coalesced", "misses"))
+        counts["hit_ratio"] = (lookups - counts.get("misses", 0)) / lookups if lookups else 0.0
+        return counts
+
+
+response_cache = ResponseCache()
+
+
+def _get_json(url, message):
+    response = http_client.get(url)
+    if response.status_code != 200:
+        raise Exception(f"{message}: {response.status_code}")
+    return response.json()
+
+
+def fetch_global_size():
+    url = f"{read_server_address()}/size"
+    return response_cache.get("/size", url, functools.partial(_get_json, url, "HTTP Error"))
+
+
+def fetch_balances():
+    server_ip = read_server_address()
+    miner_account = read_miner_account()
+    url = f"{server_ip}/account?address={miner_account}"
+    return response_cache.get("/account", url, functools.partial(_get_json, url, "Failed to refresh balance"))
+
+
+class PollScheduler:
+    """
+    Plánovač veškeré periodické práce (velikost blockchainu, zůstatky, soubory minera).
+    Úlohy běží mimo hlavní vlákno Tk, do GUI se přes `post` předává jen hotový výsledek
+    jako callback(value, error). Stejná úloha nikdy neběží dvakrát současně.
+    """
+
+    def __init__(self, post, jitter=POLL_JITTER, workers=4):
+        self.post = post
+        self.jitter = jitter
+        self.jobs = {}
+        self.heap = []
+        self.counter = itertools.count()
+        self.cond = threading.Condition()
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="poll")
+        self.stopped = False
+
+    def add(self, name, func, callback, interval, delay=0.0):
+        with self.cond:
+            self.jobs[name] = {
+                "func": func, "callback": callback, "interval": interval,
+                "due": None, "running": False, "rerun": False,
+            }
+            self._schedule(name, delay)
+
+    def remove(self, name):
+        with self.cond:
+            self.jobs.pop(name, None)
+
+    def run_now(self, name):
+        with self.cond:
+            job = self.jobs.get(name)
+            if job is None:
+                return
+            if job["running"]:
+                job["rerun"] = True
+            else:
+                self._schedule(name, 0)
+
+    def start(self):
+        threading.Thread(target=self._loop, daemon=True).start()
+
+    def stop(self):
+        with self.cond:
+            self.stopped = True
+            self.cond.notify_all()
+        self.executor.shutdown(wait=False)
+
+    def _next_delay(self, interval):
+        return max(interval * (1 + random.uniform(-self.jitter, self.jitter)), 0)
+
+    def _schedule(self, name, delay):
+        job = self.jobs[name]
+        job["due"] = time.monotonic() + delay
+        heapq.heappush(self.heap, (job["due"], next(self.counter), name))
+        self.cond.notify()
+
+    def _loop(self):
+        while True:
+            with self.cond:
+                job = None
+                while not self.stopped:
+                    if not self.heap:
+                        self.cond.wait()
+                        continue
+                    due, _, name = self.heap[0]
+                    job = self.jobs.get(name)
+                    if job is None or job["running"] or job["due"] != due:
+                        # Zastaralý záznam (úloha odebrána nebo přeplánována)
+                        heapq.heappop(self.heap)
+                        continue
+                    wait = due - time.monotonic()
+                    if wait <= 0:
+                        break
+                    self.cond.wait(wait)
+                if self.stopped:
+                    return
+                heapq.heappop(self.heap)
+                job["running"] = True
+                job["due"] = None
+            self.executor.submit(self._execute, name, job)
+
+    def _execute(self, name, job):
+        try:
+            value, error = job["func"](), None
+        except Exception as e:
+            value, error = None, e
+
+        callback = job["callback"]
+        if callback is not None:
+            self.post(lambda: callback(value, error))
+
+        with self.cond:
+            job["running"] = False
+            if self.jobs.get(name) is job and not self.stopped:
+                delay = 0 if job["rerun"] else self._next_delay(job["interval"])
+                job["rerun"] = False
+                self._schedule(name, delay)
+
+
+# Uživatelské akce (tlačítka) běží v omezeném počtu vláken s časovým limitem
+ACTION_WORKERS = 4
+ACTION_TIMEOUT = 60  # s
+
+
+class ActionExecutor:
+    """
+    Omezený pool pro uživatelské akce. Akce se stejným klíčem běží nejvýš jednou
+    (dvojklik se zahodí), lze je zrušit a po vypršení limitu se ohlásí chyba
+    (běžící vlákno nelze přerušit, doběhne samo a jeho výsledek se zahodí).
+    Výsledek přijde přes `post` jako callback(value, error); on_change(counts) se volá přímo
+    z pracovního vlákna, musí být tedy vláknově bezpečný.
+    """
+
+    def __init__(self, post, workers=ACTION_WORKERS, timeout=ACTION_TIMEOUT, on_change=None):
+        self.post = post
+        self.timeout = timeout
+        self.on_change = on_change
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="action")
+        self.actions = {}
+        self.lock = threading.Lock()
+        self.deduplicated = 0
+
+    def submit(self, key, func, *args, callback=None, timeout=None):
+        """Zařadí akci; vrací False, pokud akce se stejným klíčem už čeká nebo běží."""
+        with self.lock:
+            if key in self.actions:
+                self.deduplicated += 1
+                return False
+            action = {"key": key, "state": "queued", "callback": callback, "timer": None,
+                      "timeout": timeout or self.timeout}
+            self.actions[key] = action
+            # Future se uloží ještě pod zámkem, cancel() ho tak vždy najde
+            action["future"] = self.executor.submit(self._run, action, func, args)
+        self._changed()
+        return True
+
+    def _run(self, action, func, args):
+        with self.lock:
+            if action["state"] != "queued":
+                return
+            action["state"] = "running"
+            action["timer"] = threading.Timer(action["timeout"], self._expire, (action,))
+            action["timer"].daemon = True
+            action["timer"].start()
+        self._changed()
+        try:
+            value, error = func(*args), None
+        except Exception as e:
+            value, error = None, e
+        self._finish(action, value, error)
+
+    def _expire(self, action):
+        self._finish(action, None, TimeoutError(f"{action['key']} timed out after {action['timeout']} s"))
+
+    def _finish(self, action, value, error):
+        with self.lock:
+            # Akce už mohla skončit zrušením nebo vypršením limitu, pozdní výsledek se zahodí
+            if self.actions.get(action["key"]) is not action:
+                return
+            del self.actions[action["key"]]
+            if action["timer"] is not None:
+                action["timer"].cancel()
+        if action["callback"] is not None:
+            self.post(functools.partial(action["callback"], value, error))
+        self._changed()
+
+    def cancel(self, key):
+        with self.lock:
+            action = self.actions.get(key)
+            if action is None:
+                return False
+            action["state"] = "cancelled"
+        action["future"].cancel()
+        self._finish(action, None, CancelledError(f"{key} cancelled"))
+        return True
+
+    def cancel_all(self):
+        with self.lock:
+            keys = list(self.actions)
+        return sum(self.cancel(key) for key in keys)
+
+    def counts(self):
+        with self.lock:
+            states = [action["state"] for action in self.actions.values()]
+        return {"queued": states.count("queued"), "running": states.count("running"),
+                "deduplicated": self.deduplicated}
+
+    def _changed(self):
+        if self.on_change is not None:
+            self.on_change(self.counts())
+
+    def shutdown(self):
+        self.cancel_all()
+        self.executor.shutdown(wait=False)
+
+
+# Sledování zpoždění lokálního blockchainu za sítí a automatické /resolving
+SYNC_LAG_THRESHOLD = 5  # bloků
+SYNC_RATE_WINDOW = 120.0  # s
+SYNC_RESOLVE_BACKOFF = 30.0  # s, po každém neúspěšném dohnání se zdvojnásobí
+SYNC_RESOLVE_BACKOFF_MAX = 900.0  # s
+SYNC_AUTO_RESOLVE = True
+
+
+class SyncMonitor:
+    """
+    Z časových řad lokální a globální velikosti počítá zpoždění (lag), rychlost dohánění
+    (bloky/s) a odhad času do synchronizace. Při lagu nad prahem vyžádá /resolving přes
+    `request_resolve()`; opakuje se s exponenciálním odstupem, dokud lag neklesne.
+    """
+
+    def __init__(self, request_resolve, threshold=SYNC_LAG_THRESHOLD, window=SYNC_RATE_WINDOW,
+                 backoff=SYNC_RESOLVE_BACKOFF, backoff_max=SYNC_RESOLVE_BACKOFF_MAX, auto=SYNC_AUTO_RESOLVE):
+        self.request_resolve = request_resolve
+        self.threshold = threshold
+        self.window = window
+        self.base_backoff = backoff
+        self.backoff_max = backoff_max
+        self.auto = auto
+        self.series = {"local": collections.deque(), "global": collections.deque()}
+        self.backoff = backoff
+        self.next_resolve = 0.0
+        self.resolves = 0
+        self.lock = threading.Lock()
+
+    def add(self, series, value):
+        """Zapíše vzorek a vrátí aktuální stav (nebo None, dokud nejsou obě řady)."""
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            return None
+        now = time.monotonic()
+        with self.lock:
+            samples = self.series[series]
+            samples.append((now, value))
+            while now - samples[0][0] > self.window:
+                samples.popleft()
+            state = self._state()
+        if state is not None:
+            self._maybe_resolve(state, now)
+        return state
+
+    def _rate(self, samples):
+        if len(samples) < 2 or samples[-1][0] == samples[0][0]:
+            return 0.0
+        return (samples[-1][1] - samples[0][1]) / (samples[-1][0] - samples[0][0])
+
+    def _state(self):
+        local, remote = self.series["local"], self.series["global"]
+        if not local or not remote:
+            return None
+        lag = max(remote[-1][1] - local[-1][1], 0)
+        local_rate = self._rate(local)
+        catch_up = local_rate - self._rate(remote)
+        eta = lag / catch_up if lag and catch_up > 0 else (0.0 if not lag else None)
+        return {"lag": lag, "local_rate": local_rate, "catch_up_rate": catch_up, "eta": eta,
+                "auto": self.auto, "resolves": self.resolves}
+
+    def _maybe_resolve(self, state, now):
+        with self.lock:
+            if state["lag"] <= self.threshold:
+                self.backoff = self.base_backoff  # synchronizováno, odstup znovu od začátku
+                return
+            if not self.auto or now < self.next_resolve:
+                return
+            self.next_resolve = now + self.backoff
+            self.backoff = min(self.backoff * 2, self.backoff_max)
+            self.resolves += 1
+        self.request_resolve()
+
+    def set_auto(self, enabled):
+        with self.lock:
+            self.auto = enabled
+            self.next_resolve = 0.0
+
+
+def format_sync_state(state):
+    if state["lag"] == 0:
+        return "In sync"
+    text = f"Lag: {state['lag']} blocks"
+    if state["eta"] is not None:
+        return f"{text}, {state['catch_up_rate']:.2f} blk/s, ETA {state['eta']:.0f} s"
+    return f"{text}, not catching up"
+
+
+# Čtení výstupu JVM: velikost čteného bloku a kdy předat dávku do GUI
+PUMP_CHUNK_SIZE = 64 * 1024
+PUMP_BATCH_BYTES = 256 * 1024
+PUMP_BATCH_INTERVAL = 0.1  # s
+PUMP_RATE_WINDOW = 10.0  # s
+
+
+class LogPump:
+    """
+    Přečte stdout procesu po velkých binárních blocích, rozdělí je na celé řádky
+    a předává je do `sink` po dávkách - když se roura vyprázdní, když dávka přeroste
+    PUMP_BATCH_BYTES nebo uplyne PUMP_BATCH_INTERVAL. Počítá řádky/s a bajty/s.
+    """
+
+    def __init__(self, stream, sink, chunk_size=PUMP_CHUNK_SIZE, batch_bytes=PUMP_BATCH_BYTES,
+                 batch_interval=PUMP_BATCH_INTERVAL, encoding=None):
+        self.stream = stream
+        self.sink = sink
+        self.chunk_size = chunk_size
+        self.batch_bytes = batch_bytes
+        self.batch_interval = batch_interval
+        self.encoding = encoding or locale.getpreferredencoding(False)
+        self.lines = 0
+        self.bytes = 0
+        self.batches = 0
+        self.started = time.monotonic()
+        self.samples = collections.deque()
+        self.lock = threading.Lock()
+
+    def run(self):
+        batch = []
+        batch_size = 0
+        batch_started = time.monotonic()
+        remainder = b""
+
+        while True:
+            chunk = self.stream.read(self.chunk_size)
+            if not chunk:
+                break
+            data = remainder + chunk if remainder else chunk
+            end = data.rfind(b"\n")
+            if end < 0:
+                remainder = data
+            else:
+                remainder = data[end + 1:]
+                batch.append(data[:end + 1])
+                batch_size += end + 1
+
+            drained = len(chunk) < self.chunk_size
+            now = time.monotonic()
+            if batch and (drained or batch_size >= self.batch_bytes or now - batch_started >= self.batch_interval):
+                self._emit(batch, batch_size)
+                batch = []
+                batch_size = 0
+                batch_started = now
+
+        if remainder:
+            batch.append(remainder + b"\n")
+            batch_size += len(remainder) + 1
+        if batch:
+            self._emit(batch, batch_size)
+
+    def _emit(self, batch, batch_size):
+        data = b"".join(batch)
+        line_count = data.count(b"\n")
+        now = time.monotonic()
+        with self.lock:
+            self.lines += line_count
+            self.bytes += batch_size
+            self.batches += 1
+            self.samples.append((now, line_count, batch_size))
+            while self.samples and now - self.samples[0][0] > PUMP_RATE_WINDOW:
+                self.samples.popleft()
+        self.sink(data.decode(self.encoding, errors="replace"))
+
+    def stats(self):
+        now = time.monotonic()
+        with self.lock:
+            while self.samples and now - self.samples[0][0] > PUMP_RATE_WINDOW:
+                self.samples.popleft()
+            window = min(PUMP_RATE_WINDOW, max(now - self.started, 1e-6))
+            return {
+                "lines": self.lines,
+                "bytes": self.bytes,
+                "batches": self.batches,
+                "lines_per_sec": sum(s[1] for s in self.samples) / window,
+                "bytes_per_sec": sum(s[2] for s in self.samples) / window,
+            }
+
+
+# Trvalé úložiště výstupu JVM (SQLite) s indexy pro hledání podle času, úrovně a textu
+LOG_STORE_FILE = "jvm_logs.db"
+LOG_STORE_RETENTION = 7 * 86400  # s
+LOG_STORE_MAX_BYTES = 256 * 1024 * 1024
+LOG_STORE_PRUNE_INTERVAL = 300  # s
+LOG_STORE_PRUNE_FRACTION = 0.1  # rezerva pod limitem velikosti po smazání nejstarších řádků
+LOG_STORE_QUEUE_SIZE = 256  # dávek z LogPump (cca 25 s výstupu); při zahlcení se další výstup neukládá
+LOG_SEARCH_LIMIT = 500
+LOG_LEVEL_PATTERN = re.compile(r'\b(SEVERE|FATAL|ERROR|WARN(?:ING)?|INFO|DEBUG|FINE|TRACE)\b|Exception\b|^\s+at ')
+LOG_LEVELS = {
+    "SEVERE": logging.ERROR, "FATAL": logging.ERROR, "ERROR": logging.ERROR,
+    "WARN": logging.WARNING, "WARNING": logging.WARNING, "INFO": logging.INFO,
+    "DEBUG": logging.DEBUG, "FINE": logging.DEBUG, "TRACE": logging.DEBUG,
+}
+
+
+def log_level(line):
+    """Úroveň řádku výstupu JVM; výjimky a stack trace jsou ERROR, řádky bez úrovně INFO."""
+    match = LOG_LEVEL_PATTERN.search(line)
+    if not match:
+        return logging.INFO
+    return LOG_LEVELS[match.group(1)] if match.group(1) else logging.ERROR
+
+
+def format_log_row(row):
+    _, ts, level, text = row
+    return f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(ts))} {logging.getLevelName(level):<7} {text}"
+
+
+class LogStore:
+    """
+    Ukládá výstup JVM do SQLite. Dávky z LogPump jdou přes frontu na vlastní vlákno,
+    takže zápis na disk nezdržuje čtení stdout. Každý řádek má čas, úroveň a text;
+    indexy (ts) a (level, ts) a fulltext FTS5 - pokud ho SQLite umí, jinak LIKE -
+    dovolí hledat bez načtení logu do paměti. Řádky starší než `retention` se mažou,
+    a když soubor přeroste `max_bytes`, smaže se i nejstarší část.
+    """
+
+    def __init__(self, path=LOG_STORE_FILE, retention=LOG_STORE_RETENTION, max_bytes=LOG_STORE_MAX_BYTES,
+                 prune_interval=LOG_STORE_PRUNE_INTERVAL):
+        self.path = path
+        self.retention = retention
+        self.max_bytes = max_bytes
+        self.prune_interval = prune_interval
+        self.queue = queue.Queue(maxsize=LOG_STORE_QUEUE_SIZE)
+        self.thread = None
+        self.closed = False
+        self.fts = None
+        self.written = 0
+        self.dropped = 0
+        self.pruned = 0
+        self.lock = threading.Lock()
+
+    def append(self, text):
+        if self.closed:
+            return
+        # Databáze se otevírá až s prvním výstupem JVM
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, daemon=True)
+                self.thread.start()
+        try:
+            self.queue.put_nowait((time.time(), text))
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout=5):
+        with self.lock:
+            self.closed = True
+            thread = self.thread
+        if thread is not None:
+            self.queue.put(None)
+            thread.join(timeout)
+
+    def _open(self):
+        import sqlite3
+        connection = sqlite3.connect(self.path, timeout=10)
+        # auto_vacuum platí jen pro novou databázi, proto před vytvořením tabulek
+        connection.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        with connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS lines (id INTEGER PRIMARY KEY, ts REAL NOT NULL, "
+                "level INTEGER NOT NULL, text TEXT NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS lines_ts ON lines(ts)")
+            connection.execute("CREATE INDEX IF NOT EXISTS lines_level_ts ON lines(level, ts)")
+        try:
+            with connection:
+                connection.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS lines_fts USING fts5(text, content='lines', content_rowid='id')"
+                )
+                connection.execute(
+                    "CREATE TRIGGER IF NOT EXISTS lines_ai AFTER INSERT ON lines BEGIN "
+                    "INSERT INTO lines_fts(rowid, text) VALUES (new.id, new.text); END"
+                )
+                connection.execute(
+                    "CREATE TRIGGER IF NOT EXISTS lines_ad AFTER DELETE ON lines BEGIN "
+                    "INSERT INTO lines_fts(lines_fts, rowid, text) VALUES ('delete', old.id, old.text); END"
+                )
+            self.fts = True
+        except sqlite3.OperationalError:
+            self.fts = False  # SQLite bez FTS5, hledá se přes LIKE
+        return connection
+
+    def _run(self):
+        import sqlite3
+        connection = self._open()
+        last_prune = 0.0
+        try:
+            while True:
+                items = [self.queue.get()]
+                # Vše, co se mezitím nahromadilo, se zapíše v jedné transakci
+                while True:
+                    try:
+                        items.append(self.queue.get_nowait())
+                    except queue.Empty:
+                        break
+                stop = None in items
+                rows = [(ts, log_level(line), line)
+                        for ts, text in filter(None, items) for line in text.splitlines() if line.strip()]
+                if rows:
+                    try:
+                        with diagnostics.timed("sqlite", "insert"), connection:
+                            connection.executemany("INSERT INTO lines (ts, level, text) VALUES (?, ?, ?)", rows)
+                        self.written += len(rows)
+                    except sqlite3.Error:
+                        self.dropped += len(rows)  # plný disk apod.; výstup jde dál do konzole
+                now = time.monotonic()
+                if stop or now - last_prune >= self.prune_interval:
+                    self._prune(connection)
+                    last_prune = now
+                if stop:
+                    break
+        finally:
+            connection.close()
+
+    def _prune(self, connection):
+        with diagnostics.timed("sqlite", "prune"):
+            with connection:
+                deleted = connection.execute(
+                    "DELETE FROM lines WHERE ts < ?", (time.time() - self.retention,)
+                ).rowcount
+            used = self._used_bytes(connection)
+            low, high = connection.execute("SELECT MIN(id), MAX(id) FROM lines").fetchone()
+            if used > self.max_bytes and low is not None:
+                # id roste s časem, takže nejstarší podíl řádků se najde bez počítání tabulky;
+                # maže se naráz tolik, aby soubor klesl pod limit s rezervou LOG_STORE_PRUNE_FRACTION
+                fraction = max(LOG_STORE_PRUNE_FRACTION, 1 - self.max_bytes * (1 - LOG_STORE_PRUNE_FRACTION) / used)
+                cutoff = low + max(1, int((high - low + 1) * fraction))
+                with connection:
+                    deleted += connection.execute("DELETE FROM lines WHERE id < ?", (cutoff,)).rowcount
+                    # Mazání v FTS5 jen přidává záznamy o smazání, místo uvolní až sloučení indexu
+                    if self.fts:
+                        connection.execute("INSERT INTO lines_fts(lines_fts) VALUES ('optimize')")
+            if deleted:
+                self.pruned += deleted
+                connection.executescript("PRAGMA incremental_vacuum;")  # execute() by uvolnil jen jednu stránku
+                connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    @staticmethod
+    def _used_bytes(connection):
+        page_size = connection.execute("PRAGMA page_size").fetchone()[0]
+        page_count = connection.execute("PRAGMA page_count").fetchone()[0]
+        free = connection.execute("PRAGMA freelist_count").fetchone()[0]
+        return (page_count - free) * page_size
+
+    def search(self, text="", level=None, since=None, until=None, limit=LOG_SEARCH_LIMIT, before=None):
+        """
+        Řádky od nejnovějších: `level` je minimální úroveň, `since`/`until` čas (epoch s),
+        `before` id pro další stránku. Text se hledá jako prefixy slov (FTS5), jinak LIKE.
+        Vrací seznam (id, ts, level, text) nejvýš o `limit` řádcích.
+        """
+        if not os.path.exists(self.path):
+            return []
+        import sqlite3
+        connection = sqlite3.connect(self.path, timeout=10)
+        try:
+            fts = connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'lines_fts'"
+            ).fetchone() is not None
+            terms = text.split()
+            source = "lines"
+            conditions = []
+            params = []
+            if terms and fts:
+                source = "lines_fts JOIN lines ON lines.id = lines_fts.rowid"
+                conditions.append("lines_fts MATCH ?")
+                params.append(" ".join('"{}"*'.format(term.replace('"', '""')) for term in terms))
+            elif terms:
+                for term in terms:
+                    conditions.append("lines.text LIKE ? ESCAPE '\\'")
+                    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                    params.append(f"%{escaped}%")
+            if level is not None:
+                conditions.append("lines.level >= ?")
+                params.append(level)
+            if since is not None:
+                conditions.append("lines.ts >= ?")
+                params.append(since)
+            if until is not None:
+                conditions.append("lines.ts <= ?")
+                params.append(until)
+            if before is not None:
+                conditions.append("lines.id < ?")
+                params.append(before)
+            where = " WHERE " + " AND ".join(conditions) if conditions else ""
+            query = (f"SELECT lines.id, lines.ts, lines.level, lines.text FROM {source}{where} "
+                     f"ORDER BY lines.id DESC LIMIT ?")
+            with diagnostics.timed("sqlite", "search"):
+                return connection.execute(query, params + [limit]).fetchall()
+        finally:
+            connection.close()
+
+    def stats(self):
+        size = 0
+        for suffix in ("", "-wal"):
+            try:
+                size += os.path.getsize(self.path + suffix)
+            except OSError:
+                pass
+        return {"written": self.written, "dropped": self.dropped, "pruned": self.pruned,
+                "queued": self.queue.qsize(), "bytes": size}
+
+
+GITHUB_TARGET_URL = "https://github.com/CorporateFounder/unitedStates_final/raw/master/target/"
+JAR_PATTERN = re.compile(r'unitedStates-(\d+\.\d+\.\d+)-SNAPSHOT\.jar')
+JAR_MANIFEST_FILE = "jar_manifest.json"
+JAR_DOWNLOAD_CHUNK = 256 * 1024
+# Co udělat, když se na pozadí stáhne novější jar: "prompt" = zeptat se, "restart" = restartovat hned
+JAR_UPDATE_MODE = "prompt"
+
+
+def parse_version(version):
+    return tuple(int(part) for part in version.split("."))
+
+
+def jar_file_name(version):
+    return f"unitedStates-{version}-SNAPSHOT.jar"
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class JarUpdater:
+    """
+    Aktualizace .jar souboru minera.
+    Stránka s verzemi se stahuje podmíněně (ETag / If-Modified-Since), stav se drží
+    v lokálním manifestu. Jar se stahuje jen pokud chybí nebo neodpovídá manifestu,
+    přerušené stahování se navazuje přes Range, soubor se zapisuje přes .part a rename
+    a po stažení se ověří velikost a uloží SHA-256.
+    """
+
+    def __init__(self, log, directory=".", manifest_file=JAR_MANIFEST_FILE, base_url=GITHUB_TARGET_URL):
+        self.log = log
+        self.directory = directory
+        self.manifest_path = os.path.join(directory, manifest_file)
+        self.base_url = base_url
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, "r") as file:
+                return json.load(file)
+        except Exception:
+            return {"index": {}, "jars": {}}
+
+    def _save_manifest(self):
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(self.manifest, file, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def jar_path(self, version):
+        return os.path.join(self.directory, jar_file_name(version))
+
+    def is_jar_valid(self, version):
+        """Ověří jar proti manifestu; hash se přepočítá jen když se změnila velikost nebo mtime."""
+        path = self.jar_path(version)
+        entry = self.manifest["jars"].get(jar_file_name(version))
+        if entry is None or not os.path.exists(path):
+            return False
+        stat = os.stat(path)
+        if stat.st_size != entry.get("size"):
+            return False
+        if stat.st_mtime == entry.get("mtime"):
+            return True
+        if file_sha256(path) != entry.get("sha256"):
+            return False
+        entry["mtime"] = stat.st_mtime
+        self._save_manifest()
+        return True
+
+    def latest_local_version(self):
+        """Nejnovější ověřená verze jaru na disku (nebo None)."""
+        versions = []
+        for name in self.manifest["jars"]:
+            match = JAR_PATTERN.fullmatch(name)
+            if match and self.is_jar_valid(match.group(1)):
+                versions.append(match.group(1))
+        return max(versions, key=parse_version) if versions else None
+
+    def check_remote_version(self):
+        """Zjistí nejnovější verzi na GitHubu; při 304 použije verzi z manifestu."""
+        index = self.manifest["index"]
+        headers = {}
+        if index.get("etag"):
+            headers["If-None-Match"] = index["etag"]
+        if index.get("last_modified"):
+            headers["If-Modified-Since"] = index["last_modified"]
+
+        response = http_client.get(self.base_url, headers=headers)
+        if response.status_code == 304 and index.get("version"):
+            return index["version"]
+        response.raise_for_status()
+
+        versions = JAR_PATTERN.findall(response.text)
+        if not versions:
+            raise Exception("No valid .jar file found on GitHub.")
+        version = max(versions, key=parse_version)
+        self.manifest["index"] = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "version": version,
+            "checked_at": time.time(),
+        }
+        self._save_manifest()
+        return version
+
+    def check_for_update(self, current_version):
+        """
+        Zjistí, zda je na GitHubu novější verze než current_version, a případně ji stáhne.
+        Vrací novou verzi nebo None.
+        """
+        version = self.check_remote_version()
+        if parse_version(version) <= parse_version(current_version):
+            return None
+        if not self.is_jar_valid(version):
+            self.download(version)
+        return version
+
+    def ensure_latest(self):
+        """Vrátí cestu k aktuálnímu jaru, podle potřeby ho stáhne."""
+        try:
+            version = self.check_remote_version()
+        except Exception as e:
+            local_version = self.latest_local_version()
+            if local_version is None:
+                raise
+            self.log(f"Error checking for .jar updates ({e}), using local version {local_version}")
+            return self.jar_path(local_version)
+
+        if self.is_jar_valid(version):
+            self.log(f".jar file is up to date: {jar_file_name(version)}")
+            return self.jar_path(version)
+
+        self.download(version)
+        return self.jar_path(version)
+
+    def download(self, version):
+        name = jar_file_name(version)
+        path = self.jar_path(version)
+        part_path = path + ".part"
+        entry = self.manifest["jars"].get(name, {})
+
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        headers = {}
+        if offset and entry.get("etag"):
+            # Navázání přerušeného stahování, If-Range zajistí, že se soubor mezitím nezměnil
+            headers["Range"] = f"bytes={offset}-"
+            headers["If-Range"] = entry["etag"]
+        else:
+            offset = 0
+
+        self.log(f"Downloading {name}" + (f" (resuming at {offset} bytes)" if offset else "") + "...")
+        response = http_client.get(self.base_url + name, headers=headers, stream=True, timeout=(5, 60))
+        if response.status_code == 416:
+            # Rozpracovaný soubor neodpovídá serveru - stáhne se znovu celý
+            response.close()
+            os.remove(part_path)
+            return self.download(version)
+        if response.status_code == 206:
+            total = int(response.headers.get("Content-Range", "*/0").rsplit("/", 1)[-1] or 0)
+        else:
+            response.raise_for_status()
+            offset = 0
+            total = int(response.headers.get("Content-Length") or 0)
+
+        # Uložení ETagu hned, aby šlo případné přerušení navázat
+        self.manifest["jars"][name] = {"etag": response.headers.get("ETag"), "version": version}
+        self._save_manifest()
+
+        digest = hashlib.sha256()
+        if offset:
+            with open(part_path, "rb") as file:
+                for chunk in iter(lambda: file.read(1024 * 1024), b""):
+                    digest.update(chunk)
+
+        with open(part_path, "ab" if offset else "wb") as file:
+            for chunk in response.iter_content(chunk_size=JAR_DOWNLOAD_CHUNK):
+                file.write(chunk)
+                digest.update(chunk)
+            file.flush()
+            os.fsync(file.fileno())
+
+        size = os.path.getsize(part_path)
+        if total and size != total:
+            raise Exception(f"Incomplete download of {name}: {size} of {total} bytes")
+
+        sha256 = digest.hexdigest()
+        if file_sha256(part_path) != sha256:
+            os.remove(part_path)
+            raise Exception(f"Checksum mismatch for {name}")
+
+        os.replace(part_path, path)
+        self.manifest["jars"][name].update({"size": size, "sha256": sha256, "mtime": os.stat(path).st_mtime})
+        self._save_manifest()
+        self.log(f"Downloaded {name} ({size} bytes, sha256 {sha256[:12]}...)")
+
+
+# Profily ladění JVM; výběr profilu se ukládá pro každý stroj zvlášť (podle hostname)
+JVM_PROFILES_FILE = "jvm_profiles.json"
+DEFAULT_JVM_PROFILES = {
+    "default": {},
+    "balanced": {"xms": "10%", "xmx": "25%", "gc": "G1", "cds": True},
+    "throughput": {
+        "xms": "50%", "xmx": "50%", "gc": "Parallel", "processors": "all", "cds": True, "priority": "high",
+    },
+}
+GC_FLAGS = {"G1": "-XX:+UseG1GC", "Parallel": "-XX:+UseParallelGC", "Serial": "-XX:+UseSerialGC"}
+WINDOWS_PRIORITY_CLASSES = {
+    "idle": 0x00000040,
+    "below_normal": 0x00004000,
+    "normal": 0x00000020,
+    "above_normal": 0x00008000,
+    "high": 0x00000080,
+}
+POSIX_NICE_LEVELS = {"idle": 19, "below_normal": 10, "normal": 0, "above_normal": -5, "high": -10}
+
+
+class MEMORYSTATUSEX(ctypes.Structure):
+    _fields_ = [
+        ("dwLength", ctypes.c_ulong),
+        ("dwMemoryLoad", ctypes.c_ulong),
+        ("ullTotalPhys", ctypes.c_ulonglong),
+        ("ullAvailPhys", ctypes.c_ulonglong),
+        ("ullTotalPageFile", ctypes.c_ulonglong),
+        ("ullAvailPageFile", ctypes.c_ulonglong),
+        ("ullTotalVirtual", ctypes.c_ulonglong),
+        ("ullAvailVirtual", ctypes.c_ulonglong),
+        ("sullAvailExtendedVirtual", ctypes.c_ulonglong),
+    ]
+
+
+def total_memory_bytes():
+    """Velikost fyzické paměti stroje v bajtech (None, pokud ji nelze zjistit)."""
+    try:
+        if os.name == "nt":
+            status = MEMORYSTATUSEX()
+            status.dwLength = ctypes.sizeof(MEMORYSTATUSEX)
+            ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status))
+            return status.ullTotalPhys
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except Exception:
+        return None
+
+
+def resolve_memory(value):
+    """Převede "25%" (podíl RAM) nebo "2048m"/"4g" na hodnotu pro -Xms/-Xmx."""
+    value = str(value).strip().lower()
+    if not value.endswith("%"):
+        return value
+    total = total_memory_bytes()
+    if not total:
+        return None
+    megabytes = int(total * float(value[:-1]) / 100 / (1024 * 1024))
+    return f"{max(megabytes, 64)}m"
+
+
+def scale_memory(value, share):
+    """Zmenší podíl RAM ("50%") na `share` z něj; absolutní velikosti ("4g") nechá beze změny."""
+    text = str(value).strip()
+    if not text.endswith("%"):
+        return value
+    return f"{float(text[:-1]) * share:g}%"
+
+
+def build_jvm_command(java_exe, jar_path, profile):
+    """Sestaví příkaz pro spuštění minera podle profilu ladění."""
+    args = [java_exe]
+    for option in ("xms", "xmx"):
+        if profile.get(option):
+            size = resolve_memory(profile[option])
+            if size:
+                args.append(f"-X{option[1:]}{size}")
+    if profile.get("gc") in GC_FLAGS:
+        args.append(GC_FLAGS[profile["gc"]])
+
+    processors = profile.get("processors")
+    if profile.get("affinity") and processors in (None, "all"):
+        # JVM má vidět jen jádra, na která je proces připnutý
+        processors = len(profile["affinity"])
+    elif processors == "all":
+        processors = os.cpu_count()
+    if processors:
+        args.append(f"-XX:ActiveProcessorCount={int(processors)}")
+
+    if profile.get("cds"):
+        # Archiv tříd pro rychlejší start JVM; vytvoří se při prvním řádném ukončení JVM
+        archive = jar_path + ".jsa"
+        args.append("-XX:+IgnoreUnrecognizedVMOptions")
+        if os.path.exists(archive):
+            args += [f"-XX:SharedArchiveFile={archive}", "-Xshare:auto"]
+        else:
+            args.append(f"-XX:ArchiveClassesAtExit={archive}")
+
+    args += list(profile.get("extra_args", []))
+    args += ["-jar", jar_path]
+    return args
+
+
+def process_creation_flags(profile):
+    flags = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+    if os.name == "nt" and profile.get("priority") in WINDOWS_PRIORITY_CLASSES:
+        flags |= WINDOWS_PRIORITY_CLASSES[profile["priority"]]
+    return flags
+
+
+def apply_process_tuning(process, profile, log):
+    """Nastaví afinitu k jádrům a (mimo Windows) prioritu běžícího procesu."""
+    affinity = profile.get("affinity")
+    try:
+        if affinity:
+            if os.name == "nt":
+                mask = sum(1 << cpu for cpu in affinity)
+                ctypes.windll.kernel32.SetProcessAffinityMask(int(process._handle), mask)
+            else:
+                os.sched_setaffinity(process.pid, set(affinity))
+        if os.name != "nt" and profile.get("priority") in POSIX_NICE_LEVELS:
+            os.setpriority(os.PRIO_PROCESS, process.pid, POSIX_NICE_LEVELS[profile["priority"]])
+    except Exception as e:
+        log(f"Error applying process tuning: {e}")
+
+
+class JvmProfileStore:
+    """Uložené profily ladění JVM a volba aktivního profilu pro tento stroj."""
+
+    def __init__(self, path=JVM_PROFILES_FILE):
+        self.path = path
+        self.machine = socket.gethostname()
+        self.data = {"profiles": {}, "machines": {}}
+        try:
+            with open(path, "r") as file:
+                self.data.update(json.load(file))
+        except Exception:
+            pass
+
+    def profiles(self):
+        profiles = dict(DEFAULT_JVM_PROFILES)
+        profiles.update(self.data["profiles"])
+        return profiles
+
+    def active_name(self):
+        name = self.data["machines"].get(self.machine, "default")
+        return name if name in self.profiles() else "default"
+
+    def active_profile(self):
+        return self.profiles()[self.active_name()]
+
+    def set_active(self, name):
+        self.data["machines"][self.machine] = name
+        self.save()
+
+    def save_profile(self, name, profile):
+        self.data["profiles"][name] = profile
+        self.save()
+
+    def save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(self.data, file, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+class StartupTimer:
+    """Měří délku jednotlivých fází startu (stavba widgetů, uzly, jar, JVM) a loguje je."""
+
+    def __init__(self, log):
+        self.log = log
+        self.started = time.perf_counter()
+        self.phases = {}
+        self.lock = threading.Lock()
+
+    def begin(self, name):
+        with self.lock:
+            self.phases[name] = [time.perf_counter(), None]
+
+    def end(self, name):
+        with self.lock:
+            phase = self.phases.get(name)
+            if phase is None or phase[1] is not None:
+                return
+            phase[1] = time.perf_counter()
+            duration = phase[1] - phase[0]
+        self.log(f"[startup] {name}: {duration * 1000:.0f} ms")
+
+    def mark(self, name, target=None):
+        """Zaloguje čas od spuštění aplikace (např. time-to-first-frame), volitelně proti cíli v s."""
+        elapsed = time.perf_counter() - self.started
+        diagnostics.observe("startup", name, elapsed)
+        if target is not None and elapsed > target:
+            self.log(f"[startup] {name} after {elapsed * 1000:.0f} ms - over the {target * 1000:.0f} ms target")
+        else:
+            self.log(f"[startup] {name} after {elapsed * 1000:.0f} ms")
+
+
+# Heslo z URL /sendCoin se nesmí dostat do konzole, jejího logu na disku ani do žurnálu výplat
+PASSWORD_PATTERN = re.compile(r'(password=)[^&\s]*')
+
+
+def redact_password(text):
+    return PASSWORD_PATTERN.sub(r'\1***', text)
+
+
+def perform_http_get(url):
+    try:
+        response = http_client.get(url)
+        return response.json()
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def perform_http_post_form(url, data):
+    try:
+        response = http_client.post(url, data=data)
+        return response.json()
+    except Exception as e:
+        return {"error": str(e)}
+
+
+# Vzory ve výstupu JVM, ze kterých se počítají metriky: (jméno, druh, regex).
+# "counter" počítá výskyty, "gauge" si pamatuje poslední hodnotu první skupiny regexu.
+LOG_PATTERNS = [
+    ("hashrate", "gauge", r"(\d+(?:\.\d+)?)\s*(?:H|hash(?:es)?)/s"),
+    ("blocks_found", "counter", r"(?i)block (?:found|mined)|mined (?:a )?block"),
+    ("blocks_rejected", "counter", r"(?i)block (?:was )?rejected|rejected block|invalid block"),
+    ("sync_size", "gauge", r"(?i)\bsize[:=]\s*(\d+)"),
+    ("errors", "counter", r"(?i)\b(?:error|exception)\b"),
+]
+METRICS_RATE_WINDOW = 60.0  # s
+METRICS_PREFIX = "citu_"
+
+
+class MetricsRegistry:
+    """Čítače, měřidla a klouzavé rychlosti pro jednu instanci minera."""
+
+    def __init__(self, labels=None, window=METRICS_RATE_WINDOW):
+        self.labels = labels or {}
+        self.window = window
+        self.counters = {}
+        self.gauges = {}
+        self.events = {}
+        self.collectors = []
+        self.lock = threading.Lock()
+
+    def inc(self, name, amount=1):
+        now = time.monotonic()
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+            samples = self.events.setdefault(name, collections.deque())
+            samples.append((now, amount))
+            self._trim(samples, now)
+
+    def set(self, name, value):
+        with self.lock:
+            self.gauges[name] = value
+
+    def add_collector(self, collector):
+        """collector() vrací slovník měřidel, která se přečtou až při čtení metrik."""
+        self.collectors.append(collector)
+
+    def _trim(self, samples, now):
+        while samples and now - samples[0][0] > self.window:
+            samples.popleft()
+
+    def rate(self, name):
+        """Počet událostí za sekundu v posledním okně."""
+        now = time.monotonic()
+        with self.lock:
+            samples = self.events.get(name)
+            if not samples:
+                return 0.0
+            self._trim(samples, now)
+            return sum(amount for _, amount in samples) / self.window
+
+    def snapshot(self):
+        gauges = {}
+        for collector in self.collectors:
+            try:
+                gauges.update(collector())
+            except Exception:
+                pass
+        with self.lock:
+            gauges.update(self.gauges)
+            counters = dict(self.counters)
+        return {
+            "labels": dict(self.labels),
+            "counters": counters,
+            "gauges": gauges,
+            "rates": {name: self.rate(name) for name in counters},
+        }
+
+
+def render_prometheus(registries):
+    """Textový formát Prometheus pro jednu nebo více instancí (metriky seskupené podle jména)."""
+    families = {}
+    for registry in registries:
+        snapshot = registry.snapshot()
+        labels = ",".join(f'{key}="{value}"' for key, value in sorted(snapshot["labels"].items()))
+        suffix = f"{{{labels}}}" if labels else ""
+        for name, value in snapshot["counters"].items():
+            families.setdefault((f"{METRICS_PREFIX}{name}_total", "counter"), []).append(f"{suffix} {value}")
+        for name, value in snapshot["gauges"].items():
+            if isinstance(value, (int, float)):
+                families.setdefault((f"{METRICS_PREFIX}{name}", "gauge"), []).append(f"{suffix} {value}")
+
+    lines = []
+    for (name, kind), samples in sorted(families.items()):
+        lines.append(f"# TYPE {name} {kind}")
+        lines += [f"{name}{sample}" for sample in samples]
+    return "\n".join(lines) + "\n"
+
+
+class LogMetricsParser:
+    """Převádí dávky výstupu JVM na typované události a zapisuje je do MetricsRegistry."""
+
+    def __init__(self, registry, patterns=LOG_PATTERNS):
+        self.registry = registry
+        self.patterns = [(name, kind, re.compile(pattern, re.MULTILINE)) for name, kind, pattern in patterns]
+
+    def feed(self, text):
+        """Zpracuje celou dávku najednou; vrací seznam událostí (jméno, hodnota)."""
+        events = []
+        self.registry.inc("log_lines", text.count("\n"))
+        for name, kind, pattern in self.patterns:
+            if kind == "counter":
+                count = sum(1 for _ in pattern.finditer(text))
+                if count:
+                    self.registry.inc(name, count)
+                    events.append((name, count))
+            else:
+                last = None
+                for last in pattern.finditer(text):
+                    pass
+                if last is not None:
+                    try:
+                        value = float(last.group(1))
+                    except (IndexError, ValueError):
+                        continue
+                    self.registry.set(name, value)
+                    events.append((name, value))
+        return events
+
+
+class MetricsServer:
+    """Lokální HTTP endpoint s metrikami: /metrics (Prometheus) a /metrics.json."""
+
+    def __init__(self, render_text, render_json, port, host="127.0.0.1"):
+        self.render_text = render_text
+        self.render_json = render_json
+        self.address = (host, port)
+        self.server = None
+
+    def start(self):
+        # http.server se načítá jen když je endpoint zapnutý
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        render_text = self.render_text
+        render_json = self.render_json
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/metrics":
+                    body = render_text().encode("utf-8")
+                    content_type = "text/plain; version=0.0.4"
+                elif self.path == "/metrics.json":
+                    body = json.dumps(render_json()).encode("utf-8")
+                    content_type = "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(self.address, Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+
+# Hromadné výplaty: stejné pravidlo pro částky jako ve formuláři (nejvýš dvě desetinná místa)
+DECIMAL_PATTERN = re.compile(r'^\d*\.?\d{0,2}$')
+PAYOUT_FIELDS = ("recipient", "dollar", "stock", "reward")
+PAYOUT_CONCURRENCY = 4
+PAYOUT_RATE = 5.0  # odeslání za sekundu
+# Stavy v žurnálu: "sending" bez dalšího záznamu (přerušení) a "unknown" (chyba až po odeslání)
+# znamenají, že výsledek není známý; takové řádky se automaticky znovu neposílají
+PAYOUT_DONE_STATES = ("sent", "invalid")
+PAYOUT_UNKNOWN_STATES = ("sending", "unknown")
+
+
+def load_payout_rows(path):
+    """
+    Načte příjemce z CSV (hlavička recipient,dollar[,stock,reward]) nebo JSON
+    (seznam objektů nebo {"payouts": [...]}); vrací seznam řádků s klíčem "id".
+    """
+    with open(path, "r", newline="") as file:
+        if path.lower().endswith(".json"):
+            data = json.load(file)
+            records = data.get("payouts", []) if isinstance(data, dict) else data
+        else:
+            records = list(csv.DictReader(file))
+
+    rows = []
+    occurrences = collections.Counter()
+    for number, record in enumerate(records, 1):
+        row = {field: str(record.get(field) or "").strip() for field in PAYOUT_FIELDS}
+        row["stock"] = row["stock"] or "0"
+        row["reward"] = row["reward"] or "0"
+        # Id je odvozené z obsahu a pořadí mezi stejnými řádky, ne z čísla řádku: po odmazání
+        # odeslaných řádků ze souboru si zbylé id ponechají a upravený řádek je nový
+        content = "|".join(row[field] for field in PAYOUT_FIELDS)
+        occurrences[content] += 1
+        key = f"{content}|{occurrences[content]}"
+        row["id"] = hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+        row["line"] = number
+        rows.append(row)
+    return rows
+
+
+def validate_payout_row(row):
+    """Vrací popis chyby, nebo None pokud je řádek v pořádku."""
+    if not row["recipient"]:
+        return "missing recipient"
+    for field in ("dollar", "stock", "reward"):
+        if not row[field] or not DECIMAL_PATTERN.match(row[field]) or row[field] == ".":
+            return f"invalid {field} amount '{row[field]}' (up to two decimal places)"
+    if float(row["dollar"]) <= 0:
+        return "dollar must be greater than 0"
+    return None
+
+
+def lock_file(path):
+    """Exkluzivní zámek mezi procesy i v rámci procesu; vrací otevřený soubor (zámek drží), nebo None."""
+    file = open(path, "a+")
+    try:
+        if os.name == "nt":
+            import msvcrt
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        file.close()
+        return None
+    return file
+
+
+class PayoutJournal:
+    """
+    Žurnál stavů řádků hromadné výplaty (JSON lines, každý zápis se hned ukládá na disk).
+    Před odesláním se zapíše "sending", po odpovědi "sent" nebo "failed".
+    Soubor `<žurnál>.lock` je po dobu výplaty zamčený, aby stejný soubor neplatily dvě výplaty
+    najednou (GUI a příkazová řádka, nebo dvě spuštění).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = lock_file(f"{path}.lock")
+        if self.lock is None:
+            raise RuntimeError(f"{path} is in use by another payout")
+        self.states = {}
+        self.write_lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, "r") as file:
+                for line in file:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # neúplný poslední řádek po pádu
+                    self.states[record["id"]] = record
+        self.file = open(path, "a")
+
+    def state(self, row_id):
+        record = self.states.get(row_id)
+        return record["status"] if record else None
+
+    def record(self, row, status, detail=""):
+        record = {"id": row["id"], "line": row["line"], "recipient": row["recipient"],
+                  "dollar": row["dollar"], "status": status, "detail": detail, "time": time.time()}
+        with self.write_lock:
+            self.states[row["id"]] = record
+            self.file.write(json.dumps(record) + "\n")
+            self.file.flush()
+            os.fsync(self.file.fileno())
+
+    def close(self):
+        self.file.close()
+        self.lock.close()
+
+
+class RateLimiter:
+    """Rozloží volání rovnoměrně, nejvýš `rate` za sekundu napříč vlákny."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.next_slot = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def failed_before_send(error):
+    """
+    True, pokud požadavek prokazatelně neodešel (spojení se nenavázalo, neplatné URL).
+    Po timeoutu čtení nebo přerušeném spojení mohl server převod už provést.
+    """
+    import requests
+    from urllib3.exceptions import NewConnectionError
+    if isinstance(error, (requests.ConnectTimeout, requests.exceptions.InvalidURL,
+                          requests.exceptions.MissingSchema, requests.exceptions.InvalidSchema)):
+        return True
+    if isinstance(error, requests.ConnectionError) and error.args:
+        return isinstance(getattr(error.args[0], "reason", None), NewConnectionError)
+    return False
+
+
+class PayoutBatch:
+    """
+    Odešle řádky výplaty přes `send(recipient, dollar, stock, reward)` souběžně a s omezenou
+    rychlostí. Řádky již odeslané podle žurnálu se přeskočí; řádky s neznámým výsledkem
+    (přerušené uprostřed nebo bez odpovědi) se znovu neodesílají, aby se nic neposlalo dvakrát.
+    """
+
+    def __init__(self, send, rows, journal, log, concurrency=PAYOUT_CONCURRENCY, rate=PAYOUT_RATE,
+                 retry_failed=False):
+        self.send = send
+        self.rows = rows
+        self.journal = journal
+        self.log = log
+        self.concurrency = concurrency
+        self.limiter = RateLimiter(rate)
+        self.retry_failed = retry_failed
+        self.cancelled = threading.Event()
+        self.summary = collections.Counter()
+        self.summary_lock = threading.Lock()
+
+    def _count(self, status):
+        with self.summary_lock:
+            self.summary[status] += 1
+
+    def pending_rows(self):
+        rows = []
+        for row in self.rows:
+            state = self.journal.state(row["id"])
+            if state in PAYOUT_DONE_STATES:
+                self._count(f"already_{state}")
+            elif state in PAYOUT_UNKNOWN_STATES:
+                self._count("unknown")
+                self.log(f"Payout line {row['line']} ({row['recipient']}) has an unknown result from a previous run; "
+                         f"check the recipient's balance, it is not sent again.")
+            elif state == "failed" and not self.retry_failed:
+                self._count("already_failed")
+            else:
+                error = validate_payout_row(row)
+                if error:
+                    self.journal.record(row, "invalid", error)
+                    self._count("invalid")
+                    self.log(f"Payout line {row['line']} skipped: {error}")
+                else:
+                    rows.append(row)
+        return rows
+
+    def _send_row(self, row):
+        if self.cancelled.is_set():
+            return
+        self.limiter.wait()
+        self.journal.record(row, "sending")
+        try:
+            response = self.send(row["recipient"], row["dollar"], row["stock"], row["reward"])
+            if response.status_code == 200:
+                self.journal.record(row, "sent", response.text[:200])
+                self._count("sent")
+                return
+            detail = f"HTTP {response.status_code}: {response.text[:200]}"
+        except Exception as e:
+            detail = redact_password(str(e))  # chyby requests obsahují celé URL
+            if not failed_before_send(e):
+                self.journal.record(row, "unknown", detail)
+                self._count("unknown")
+                self.log(f"Payout line {row['line']} ({row['recipient']}) has an unknown result: {detail}; "
+                         f"check the recipient's balance, it is not sent again.")
+                return
+        self.journal.record(row, "failed", detail)
+        self._count("failed")
+        self.log(f"Payout line {row['line']} ({row['recipient']}) failed: {detail}")
+
+    def run(self):
+        rows = self.pending_rows()
+        self.log(f"Payout: {len(rows)} of {len(self.rows)} rows to send.")
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="payout") as executor:
+            list(executor.map(self._send_row, rows))
+        self.log(f"Payout finished: {dict(self.summary)}")
+        return dict(self.summary)
+
+    def cancel(self):
+        self.cancelled.set()
+
+
+# Dohled nad JVM: interval kontrol, kdy je proces považován za zaseknutý, a odstup restartů
+SUPERVISOR_INTERVAL = 10  # s
+SUPERVISOR_HANG_QUIET = 120  # s bez výstupu
+SUPERVISOR_HANG_FAILURES = 3  # po sobě jdoucí neúspěšné kontroly API
+SUPERVISOR_STARTUP_GRACE = 180  # s po startu, kdy se zaseknutí nevyhodnocuje
+SUPERVISOR_BACKOFF = 2.0  # s, zdvojnásobuje se při opakovaných pádech
+SUPERVISOR_BACKOFF_MAX = 300.0  # s
+SUPERVISOR_STABLE = 300  # s běhu bez problémů, po kterých se odstup vynuluje
+
+
+class JvmSupervisor:
+    """
+    Hlídá JVM minera: při ukončení procesu ho restartuje s exponenciálním odstupem,
+    zaseknutí (žádný výstup a API neodpovídá) řeší zabitím procesu, které vede na restart.
+    Po restartu obnoví peněženku, obtížnost, server a konstantní těžbu.
+    """
+
+    def __init__(self, controller, interval=SUPERVISOR_INTERVAL, hang_quiet=SUPERVISOR_HANG_QUIET,
+                 backoff=SUPERVISOR_BACKOFF, backoff_max=SUPERVISOR_BACKOFF_MAX):
+        self.controller = controller
+        self.interval = interval
+        self.hang_quiet = hang_quiet
+        self.base_backoff = backoff
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.stop_event = threading.Event()
+        self.lock = threading.Lock()
+        self.restart_pending = False
+        self.api_failures = 0
+        self.started_at = time.monotonic()
+        self.api_seen = False
+        self.restarts = 0
+        self.last_reason = None
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True, name="jvm-supervisor").start()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def _run(self):
+        while not self.stop_event.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                self.controller.log(f"Supervisor: health check failed: {e}")
+
+    def state(self):
+        return {"restarts": self.restarts, "last_reason": self.last_reason, "backoff": self.backoff,
+                "api_failures": self.api_failures}
+
+    def process_started(self):
+        with self.lock:
+            self.restart_pending = False
+            self.api_failures = 0
+            self.api_seen = False
+            self.started_at = time.monotonic()
+
+    def process_exited(self, process):
+        """Volá vlákno čtoucí výstup JVM po skončení procesu; záměrná ukončení a náhrady se ignorují."""
+        controller = self.controller
+        if self.stop_event.is_set() or process is not controller.java_process:
+            return
+        self._schedule_restart(f"process exited with code {process.returncode}")
+
+    def check(self):
+        controller = self.controller
+        process = controller.java_process
+        with self.lock:
+            if process is None or self.restart_pending or process.poll() is not None:
+                return
+        now = time.monotonic()
+        try:
+            http_client.get(controller.api("/"), timeout=(2, 5), retries=0)
+            api_ok = True
+        except Exception:
+            api_ok = False
+
+        with self.lock:
+            if api_ok:
+                self.api_seen = True
+                self.api_failures = 0
+                if now - self.started_at > SUPERVISOR_STABLE:
+                    self.backoff = self.base_backoff
+                return
+            self.api_failures += 1
+            in_grace = not self.api_seen and now - self.started_at < SUPERVISOR_STARTUP_GRACE
+            quiet = now - controller.last_output
+            hung = not in_grace and self.api_failures >= SUPERVISOR_HANG_FAILURES and quiet > self.hang_quiet
+        if hung:
+            controller.log(f"Supervisor: miner hangs (no output for {quiet:.0f} s, API not responding), "
+                           f"killing process {process.pid}.")
+            # Zabití ukončí čtení výstupu a restart proběhne stejnou cestou jako po pádu
+            process.kill()
+
+    def _schedule_restart(self, reason):
+        with self.lock:
+            if self.restart_pending:
+                return
+            self.restart_pending = True
+            delay = self.backoff
+            self.backoff = min(self.backoff * 2, self.backoff_max)
+            self.restarts += 1
+            self.last_reason = reason
+        self.controller.log(f"Supervisor: {reason}, restarting miner in {delay:.0f} s...")
+        self.controller.publish("supervisor", self.state())
+        timer = threading.Timer(delay, self._restart)
+        timer.daemon = True
+        timer.start()
+
+    def _restart(self):
+        if self.stop_event.is_set():
+            return
+        if self.controller.restart_java_jar() is None:
+            # JVM se nespustila; bez dalšího pokusu by check() čekal na proces, který nepřijde
+            with self.lock:
+                self.restart_pending = False
+            self._schedule_restart("relaunch failed")
+
+
+# Automatické ladění: kandidátní obtížnosti, volitelně počty vláken JVM (vyžadují restart),
+# délka jednoho pokusu a jak často se ladění opakuje
+AUTOTUNE_DIFFICULTIES = (17, 18, 19, 20, 21, 22)
+AUTOTUNE_THREADS = None  # např. (2, 4, 8); None = počet vláken se neladí
+AUTOTUNE_WARMUP = 60  # s
+AUTOTUNE_TRIAL = 600  # s
+AUTOTUNE_RETUNE_INTERVAL = 6 * 3600  # s
+
+
+class AutoTuner:
+    """
+    Postupně zkouší nastavení (obtížnost, vlákna) přes API minera, z metrik výstupu měří
+    výnos (nalezené minus odmítnuté bloky za hodinu) a hashrate, a ponechá nejlepší.
+    Po AUTOTUNE_RETUNE_INTERVAL ladí znovu, protože se mění podmínky v síti.
+    """
+
+    def __init__(self, controller, difficulties=AUTOTUNE_DIFFICULTIES, threads=AUTOTUNE_THREADS,
+                 warmup=AUTOTUNE_WARMUP, trial=AUTOTUNE_TRIAL, retune_interval=AUTOTUNE_RETUNE_INTERVAL):
+        self.controller = controller
+        self.difficulties = list(difficulties)
+        self.threads = list(threads) if threads else [None]
+        self.warmup = warmup
+        self.trial = trial
+        self.retune_interval = retune_interval
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.lock = threading.Lock()
+        self.results = []
+        self.best = None
+
+    def start(self):
+        # Každý běh má vlastní událost zastavení. Zastavený běh může ještě čekat na HTTP volání;
+        # nový běh na něj počká, místo aby se start ztratil nebo starý běh znovu ožil
+        with self.lock:
+            if self.thread is not None and self.thread.is_alive() and not self.stop_event.is_set():
+                return
+            previous = self.thread
+            self.stop_event = threading.Event()
+            self.thread = threading.Thread(target=self._run, args=(previous, self.stop_event), daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        with self.lock:
+            self.stop_event.set()
+
+    def _run(self, previous, stop_event):
+        if previous is not None:
+            previous.join()
+        while not stop_event.is_set():
+            self.tune(stop_event)
+            if stop_event.wait(self.retune_interval):
+                break
+
+    def tune(self, stop_event=None):
+        stop_event = stop_event or self.stop_event
+        log = self.controller.log
+        self.results = []
+        log(f"Auto-tune: trying {len(self.difficulties) * len(self.threads)} settings, "
+            f"{self.trial} s each.")
+        for threads in self.threads:
+            if threads is not None and not self._apply_threads(threads):
+                continue
+            for difficulty in self.difficulties:
+                if stop_event.is_set():
+                    return None
+                result = self._trial(difficulty, threads, stop_event)
+                if result is not None:
+                    self.results.append(result)
+                    self.controller.publish("autotune", {"results": list(self.results), "best": self.best})
+
+        if not self.results:
+            log("Auto-tune: no setting could be measured.")
+            return None
+        self.best = max(self.results, key=lambda result: (result["yield"], result["hashrate"]))
+        log(f"Auto-tune: best setting {format_tune_result(self.best)}")
+        if self.best["threads"] != self.threads[-1] and self.best["threads"] is not None:
+            self._apply_threads(self.best["threads"])
+        self.controller.set_difficulty(self.best["difficulty"])
+        self.controller.publish("autotune", {"results": list(self.results), "best": self.best})
+        return self.best
+
+    def _apply_threads(self, threads):
+        """Restart JVM s daným počtem procesorů (ActiveProcessorCount) a obnovení těžby."""
+        controller = self.controller
+        base = controller.profile if controller.profile is not None else controller.jvm_profiles.active_profile()
+        controller.profile = dict(base, processors=threads)
+        controller.restart_java_jar(restore=False)
+        if not controller.wait_for_api():
+            controller.log(f"Auto-tune: miner did not come back with {threads} threads.")
+            return False
+        # Nová JVM netěží; bez obnovy by se další pokusy měřily se zastavenou těžbou
+        settings = controller.settings
+        controller.apply_mining_settings(settings.get("wallet"), None, settings.get("server"))
+        response = controller.start_mining()
+        if "error" in response:
+            controller.log(f"Auto-tune: could not resume mining with {threads} threads: {response['error']}")
+            return False
+        return True
+
+    def _trial(self, difficulty, threads, stop_event):
+        controller = self.controller
+        response = controller.set_difficulty(difficulty)
+        if "error" in response:
+            controller.log(f"Auto-tune: error setting difficulty {difficulty}: {response['error']}")
+            return None
+        if not controller.mining:
+            controller.start_mining()
+
+        # Zahřátí (JIT, nová obtížnost), pak měření rozdílu čítačů
+        if stop_event.wait(self.warmup):
+            return None
+        before = controller.metrics.snapshot()
+        hashrates = []
+        deadline = time.monotonic() + self.trial
+        while time.monotonic() < deadline:
+            if stop_event.wait(min(10, max(deadline - time.monotonic(), 0))):
+                return None
+            hashrate = controller.metrics.snapshot()["gauges"].get("hashrate")
+            if hashrate is not None:
+                hashrates.append(hashrate)
+        after = controller.metrics.snapshot()
+
+        def delta(name):
+            return after["counters"].get(name, 0) - before["counters"].get(name, 0)
+        result = {
+            "difficulty": difficulty,
+            "threads": threads,
+            "found": delta("blocks_found"),
+            "rejected": delta("blocks_rejected"),
+            "hashrate": sum(hashrates) / len(hashrates) if hashrates else 0.0,
+        }
+        result["yield"] = (result["found"] - result["rejected"]) * 3600 / self.trial
+        controller.log(f"Auto-tune: {format_tune_result(result)}")
+        return result
+
+
+def format_tune_result(result):
+    threads = f", {result['threads']} threads" if result["threads"] else ""
+    return (f"difficulty {result['difficulty']}{threads}: {result['yield']:.1f} blocks/h, "
+            f"{result['hashrate']:.1f} H/s")
+
+
+class MinerController:
+    """
+    Řízení minera bez GUI: hledání Javy, aktualizace jaru, spuštění a restart JVM,
+    periodické dotazy a volání REST API minera. GUI i headless režim se k němu jen připojují.
+    Změny stavu dostávají posluchači jako listener(name, value, error) přes funkci `post`
+    (v GUI je to fronta hlavního vlákna Tk, v headless režimu přímé volání).
+    """
+
+    def __init__(self, log, post=None, api_url=LOCAL_API_URL, on_update_ready=None, name=None,
+                 profile=None, profile_name=None, workdir=None, metrics_port=None, supervise=True):
+        self.log = log
+        self.post = post or (lambda func: func())
+        self.api_url = api_url
+        self.on_update_ready = on_update_ready
+        # Ve flotile má každá instance vlastní jméno, profil JVM a pracovní adresář
+        self.name = name
+        self.profile = profile
+        self.profile_name = profile_name
+        self.workdir = workdir
+        self.mining = False
+        self.metrics = MetricsRegistry(labels={"instance": name} if name else None)
+        self.metrics.add_collector(self._pump_metrics)
+        self.metrics.add_collector(self._cache_metrics)
+        self.log_store = LogStore(os.path.join(workdir, LOG_STORE_FILE) if workdir else LOG_STORE_FILE)
+        # Zdroje diagnostiky se při shutdown odeberou, aby snapshot nesahal na zavřené objekty
+        self.diagnostic_sources = {
+            f"pump {name}" if name else "pump": self._pump_metrics,
+            f"log store {name}" if name else "log store": self.log_store.stats,
+        }
+        for source, func in self.diagnostic_sources.items():
+            diagnostics.add_source(source, func)
+        self.log_parser = LogMetricsParser(self.metrics)
+        self.metrics_port = metrics_port
+        self.metrics_server = None
+        self.listeners = []
+        self.state = {}
+        self.java_process = None
+        self.process_lock = threading.Lock()
+        self.java_exe = None
+        self.jar_path = None
+        self.log_pump = None
+        self.jvm_profiles = JvmProfileStore()
+        self.startup = StartupTimer(log)
+        self.scheduler = PollScheduler(lambda func: func())
+        self.payout = None
+        self.payout_lock = threading.Lock()
+        self.sync = SyncMonitor(self._auto_resolve)
+        self.autotuner = None
+        self.settings = {}
+        self.last_output = time.monotonic()
+        self.supervisor = JvmSupervisor(self) if supervise else None
+        self.actions = ActionExecutor(self.post, on_change=functools.partial(self.publish, "actions"))
+        self.known_nodes, self.nodes_fresh = load_cached_nodes()
+        self.selected_server = None
+        self.auto_server_enabled = False
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def publish(self, name, value, error=None):
+        self.state[name] = (value, error)
+        for listener in list(self.listeners):
+            self.post(functools.partial(listener, name, value, error))
+
+    def start(self, poll=True):
+        """Spustí periodické dotazy, JVM a obnovu seznamu uzlů (nic z toho neblokuje)."""
+        if poll:
+            self.start_polling()
+        if self.metrics_port:
+            self.start_metrics_server(self.metrics_port)
+        threading.Thread(target=self.run_java_jar, daemon=True).start()
+        if self.supervisor is not None:
+            self.supervisor.start()
+        if not self.nodes_fresh:
+            self.refresh_nodes_async()
+
+    def shutdown(self, close_http=True):
+        """Zastaví vše, co controller spustil; flotila zavírá sdíleného HTTP klienta sama (close_http)."""
+        if self.supervisor is not None:
+            self.supervisor.stop()
+        if self.autotuner is not None:
+            self.autotuner.stop()
+        self.stop_java_process()
+        for source in self.diagnostic_sources:
+            diagnostics.remove_source(source)
+        self.log_store.close()
+        self.scheduler.stop()
+        self.actions.shutdown()
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+        if close_http:
+            http_client.close()
+
+    def start_metrics_server(self, port):
+        try:
+            self.metrics_server = MetricsServer(
+                lambda: render_prometheus([self.metrics]), self.metrics.snapshot, port
+            )
+            self.metrics_server.start()
+            self.log(f"Metrics available at http://127.0.0.1:{port}/metrics")
+        except OSError as e:
+            self.metrics_server = None
+            self.log(f"Error starting metrics endpoint on port {port}: {e}")
+
+    def _pump_metrics(self):
+        if self.log_pump is None:
+            return {}
+        stats = self.log_pump.stats()
+        return {"log_lines_per_sec": stats["lines_per_sec"], "log_bytes_per_sec": stats["bytes_per_sec"]}
+
+    def _cache_metrics(self):
+        return {f"response_cache_{name}": value for name, value in response_cache.stats().items()}
+
+    def _on_jvm_output(self, text):
+        self.last_output = time.monotonic()
+        # Rozbor výstupu na metriky, pak teprve do logu/konzole
+        for name, value in self.log_parser.feed(text):
+            if name in ("blocks_found", "blocks_rejected"):
+                self.publish("miner_event", (name, value))
+        self.log_store.append(text)
+        self.log(text)
+
+    def search_logs(self, text="", level=None, since=None, until=None, limit=LOG_SEARCH_LIMIT, before=None):
+        return self.log_store.search(text, level, since, until, limit, before)
+
+    def api(self, path):
+        return f"{self.api_url}{path}"
+
+    def wait_for_api(self, timeout=120):
+        """Počká, až REST API minera začne odpovídat."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                http_client.get(self.api("/"), timeout=(1, 2), retries=0)
+                return True
+            except Exception:
+                time.sleep(1)
+        return False
+
+    # Periodické dotazy
+
+    def start_polling(self):
+        jobs = (
+            ("local_size", read_local_size),
+            ("global_size", fetch_global_size),
+            ("balances", fetch_balances),
+            ("account_file", read_miner_account),
+            ("metrics", self.metrics.snapshot),
+        )
+        for name, func in jobs:
+            self.scheduler.add(name, func, functools.partial(self._on_poll, name), POLL_INTERVALS[name])
+        self.scheduler.start()
+
+    def _on_poll(self, name, value, error):
+        self.publish(name, value, error)
+        if error is None and name in ("local_size", "global_size"):
+            state = self.sync.add(name.split("_")[0], value)
+            if state is not None:
+                self.publish("sync", state)
+
+    def refresh(self, name):
+        self.scheduler.run_now(name)
+
+    # Uzly a výběr serveru
+
+    def refresh_nodes_async(self):
+        # Stažení seznamu uzlů ve vlákně, aby neblokovalo start
+        threading.Thread(target=self._refresh_nodes, daemon=True).start()
+
+    def _refresh_nodes(self):
+        self.startup.begin("node fetch")
+        nodes = self.fetch_nodes()
+        self.startup.end("node fetch")
+        if isinstance(nodes, list):
+            save_cached_nodes(nodes)
+            self.known_nodes = nodes
+            self.publish("nodes", nodes)
+            if self.auto_server_enabled:
+                self.scheduler.run_now("auto_server")
+        else:
+            self.log(f"Error fetching nodes: {nodes.get('error', nodes)}")
+
+    def fetch_nodes(self):
+        url = f"{NODE_REGISTRY_URL}/getNodes"
+        try:
+            response = http_client.get(url)
+            nodes = response.json()
+            return nodes
+        except Exception as e:
+            return {"error": str(e)}
+
+    def probe_servers(self, auto_select=False):
+        nodes = list(self.known_nodes)
+        if not nodes:
+            self.log("No servers to probe.")
+            return []
+        self.log(f"Probing {len(nodes)} servers...")
+        results = probe_nodes(nodes)
+        for r in results:
+            self.log(format_probe_result(r))
+        self.known_nodes = [r["node"] for r in results]
+        self.publish("nodes", self.known_nodes)
+
+        if auto_select:
+            self._select_fastest(results)
+        return results
+
+    def _select_fastest(self, results):
+        best = pick_fastest_in_sync(results)
+        if best is None:
+            self.log("Auto-select: no in-sync server available.")
+            return
+        if best["node"] == self.selected_server:
+            return
+        response = self.change_server(best["node"])
+        if "error" in response:
+            self.log(f"Auto-select: error changing server: {response['error']}")
+        else:
+            self.log(f"Auto-select: server changed to {best['node']} ({best['latency'] * 1000:.0f} ms)")
+
+    def set_auto_server(self, enabled):
+        # Pravidelné přehodnocení nejlepšího serveru obstarává plánovač
+        self.auto_server_enabled = enabled
+        if enabled:
+            self.scheduler.add(
+                "auto_server", functools.partial(self.probe_servers, True), None, POLL_INTERVALS["auto_server"]
+            )
+        else:
+            self.scheduler.remove("auto_server")
+
+    # REST API minera
+
+    def change_server(self, host):
+        response = perform_http_post_form(self.api("/server"), {"host": host})
+        if "error" not in response:
+            self.selected_server = host
+            self.settings["server"] = host
+            self.publish("server", host)
+        return response
+
+    # Úspěšně nastavené hodnoty si controller pamatuje, aby je po každém restartu JVM obnovil
+
+    def set_miner(self, address):
+        response = perform_http_post_form(self.api("/setMinner"), {"setMinner": address})
+        if "error" not in response:
+            self.settings["wallet"] = address
+        return response
+
+    def set_difficulty(self, difficulty):
+        response = perform_http_post_form(self.api("/customDiff"), {"customDiff": str(difficulty)})
+        if "error" not in response:
+            self.settings["difficulty"] = difficulty
+        return response
+
+    def start_mining(self):
+        response = perform_http_get(self.api("/constantMining"))
+        if "error" not in response:
+            self.mining = True
+        return response
+
+    def stop_mining(self):
+        response = perform_http_get(self.api("/stopMining"))
+        if "error" not in response:
+            self.mining = False
+        return response
+
+    def status(self):
+        """Stav instance: běh procesu, odezva API, těžba a propustnost výstupu."""
+        process = self.java_process
+        latency = None
+        try:
+            started = time.perf_counter()
+            http_client.get(self.api("/"), timeout=(1, 2), retries=0)
+            latency = time.perf_counter() - started
+        except Exception:
+            pass
+        pump = self.log_pump.stats() if self.log_pump else {}
+        return {
+            "name": self.name,
+            "api_url": self.api_url,
+            "pid": process.pid if process else None,
+            "alive": process is not None and process.poll() is None,
+            "api_latency": latency,
+            "mining": self.mining,
+            "lines_per_sec": pump.get("lines_per_sec", 0.0),
+        }
+
+    def _auto_resolve(self):
+        # Stejný klíč jako tlačítko Update Blockchain, dva /resolving tedy nikdy neběží současně
+        if self.actions.submit("Blockchain update", self.resolve_blockchain, callback=self._log_resolve):
+            self.log("Local blockchain is behind the network, requesting /resolving...")
+
+    def _log_resolve(self, message, error):
+        self.log(f"Error updating blockchain: {error}" if error else message)
+
+    def set_autotune(self, enabled, **options):
+        if enabled:
+            if self.autotuner is None:
+                self.autotuner = AutoTuner(self, **options)
+            self.autotuner.start()
+        elif self.autotuner is not None:
+            self.autotuner.stop()
+
+    def set_auto_resolve(self, enabled):
+        self.sync.set_auto(enabled)
+
+    def resolve_blockchain(self):
+        try:
+            response = http_client.get(self.api("/resolving"))
+            if response.status_code == 200:
+                return "Blockchain updated successfully.\n"
+            return f"Failed to update blockchain. Status code: {response.status_code}\n"
+        except Exception as e:
+            return f"Error updating blockchain: {str(e)}\n"
+
+    def staking(self, data):
+        return self._balance_changed(http_client.post(self.api("/staking"), data=data))
+
+    def unstaking(self, data):
+        return self._balance_changed(http_client.post(self.api("/unstaking"), data=data))
+
+    def _balance_changed(self, response):
+        # Po úspěšném převodu se zůstatek nesmí vrátit z cache, obnoví se hned
+        if response.status_code == 200:
+            response_cache.invalidate("/account")
+            self.refresh("balances")
+        return response
+
+    @staticmethod
+    def send_coin_params(sender, recipient, dollar, stock, reward, password):
+        return {"sender": sender, "recipient": recipient, "dollar": dollar, "stock": stock, "reward": reward,
+                "password": password}
+
+    def send_coin_url(self, sender, recipient, dollar, stock, reward):
+        """URL odesílaného požadavku jen pro výpis - heslo je vždy skryté."""
+        params = self.send_coin_params(sender, recipient, dollar, stock, reward, "***")
+        return f"{self.api_url}/sendCoin?{urlencode(params, safe='*')}"
+
+    def send_coin(self, sender, recipient, dollar, stock, reward, password):
+        return self._balance_changed(self._send_coin(sender, recipient, dollar, stock, reward, password))
+
+    def _send_coin(self, sender, recipient, dollar, stock, reward, password):
+        # Parametry kóduje requests, takže & nebo + v hesle či adrese nerozbije dotaz
+        params = self.send_coin_params(sender, recipient, dollar, stock, reward, password)
+        return http_client.get(self.api("/sendCoin"), params=params)
+
+    def fetch_keys(self):
+        return http_client.get(self.api("/keys"))
+
+    def pay_out(self, path, sender, password, journal_path=None, concurrency=PAYOUT_CONCURRENCY,
+                rate=PAYOUT_RATE, retry_failed=False):
+        """Hromadná výplata podle souboru; stav řádků se ukládá do `<soubor>.journal`."""
+        rows = load_payout_rows(path)
+        with self.payout_lock:
+            if self.payout is not None:
+                raise RuntimeError("A batch payout is already running")
+            journal = PayoutJournal(journal_path or f"{path}.journal")
+            send = functools.partial(self._send_payout, sender, password)
+            self.payout = PayoutBatch(send, rows, journal, self.log, concurrency, rate, retry_failed)
+        try:
+            return self.payout.run()
+        finally:
+            journal.close()
+            if self.payout.summary.get("sent"):
+                response_cache.invalidate("/account")
+                self.refresh("balances")
+            self.payout = None
+
+    def start_payout(self, path, sender, password, callback):
+        """
+        pay_out na vlastním vlákně mimo pool akcí: výplata nesmí mít časový limit, po kterém
+        by šla spustit znovu, zatímco první běží. Výsledek dostane callback(summary, error) přes post.
+        """
+        def run():
+            try:
+                summary, error = self.pay_out(path, sender, password), None
+            except Exception as e:
+                summary, error = None, e
+            self.post(functools.partial(callback, summary, error))
+        threading.Thread(target=run, daemon=True, name="payout").start()
+
+    def cancel_payout(self):
+        if self.payout is not None:
+            self.payout.cancel()
+
+    def _send_payout(self, sender, password, recipient, dollar, stock, reward):
+        # Zůstatek se obnoví jednou po celé dávce, ne po každém řádku
+        return self._send_coin(sender, recipient, dollar, stock, reward, password)
+
+    def apply_mining_settings(self, wallet=None, difficulty=None, server=None, mining=False):
+        """Nastaví peněženku, obtížnost, server a případně spustí těžbu (až API odpovídá)."""
+        if not self.wait_for_api():
+            self.log("Error: miner API did not come up, settings not applied.")
+            return
+        steps = [
+            (wallet, self.set_miner, "wallet"),
+            (difficulty, self.set_difficulty, "difficulty"),
+            (server, self.change_server, "server"),
+        ]
+        for value, action, label in steps:
+            if value:
+                response = action(value)
+                if "error" in response:
+                    self.log(f"Error setting {label}: {response['error']}")
+                else:
+                    self.log(f"{label.capitalize()} set to: {value}")
+        if mining:
+            response = self.start_mining()
+            if "error" in response:
+                self.log(f"Error starting mining: {response['error']}")
+            else:
+                self.log("Mining started successfully.")
+
+    # Proces JVM
+
+    def run_java_jar(self):
+        java_exe = self.resolve_java()
+        if java_exe is None:
+            return
+        jar_path = self.resolve_jar()
+        if jar_path is None:
+            return
+        with self.process_lock:
+            self.launch_jar(java_exe, jar_path)
+
+    def resolve_java(self):
+        self.startup.begin("java discovery")
+        java_home = set_java_home(self.log)
+        self.startup.end("java discovery")
+        if not java_home:
+            self.log("Error: Unable to find Java installation.")
+            return None
+
+        java_exe = java_executable(java_home)
+        if not os.path.exists(java_exe):
+            self.log(f"Error: Java not found at {java_exe}")
+            return None
+        self.java_exe = java_exe
+        return java_exe
+
+    def resolve_jar(self):
+        """Vrátí cestu k jaru, který se má spustit (nebo None při chybě)."""
+        self.startup.begin("jar check")
+        updater = JarUpdater(self.log)
+        local_version = updater.latest_local_version()
+        if local_version is None:
+            # Na disku není žádný ověřený jar - musí se nejdřív stáhnout
+            try:
+                jar_path = updater.ensure_latest()
+            except Exception as e:
+                self.log(f"Error updating .jar file: {str(e)}")
+                return None
+        else:
+            # Rychlý start: spustí se jar z disku, aktualizace se zkontroluje na pozadí
+            jar_path = updater.jar_path(local_version)
+            threading.Thread(target=self._check_jar_update, args=(updater, local_version), daemon=True).start()
+        self.startup.end("jar check")
+        return jar_path
+
+    def launch_jar(self, java_exe, jar_path):
+        """Spustí JVM a vrátí proces (nebo None); výstup čte a konec procesu hlídá vlastní vlákno."""
+        profile_name = self.profile_name or self.jvm_profiles.active_name()
+        profile = self.profile if self.profile is not None else self.jvm_profiles.active_profile()
+        command = build_jvm_command(java_exe, os.path.abspath(jar_path), profile)
+
+        try:
+            self.startup.begin("JVM spawn")
+            if self.workdir:
+                os.makedirs(self.workdir, exist_ok=True)
+            process = subprocess.Popen(
+                command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                bufsize=0,
+                cwd=self.workdir,
+                creationflags=process_creation_flags(profile)
+            )
+            self.java_process = process
+            self.jar_path = jar_path
+            self.last_output = time.monotonic()
+            if self.supervisor is not None:
+                self.supervisor.process_started()
+            apply_process_tuning(process, profile, self.log)
+            self.startup.end("JVM spawn")
+            self.log(f"Started {os.path.basename(jar_path)} with JVM profile '{profile_name}': {' '.join(command[1:-2])}")
+        except Exception as e:
+            self.log(f"Error starting Java Jar: {str(e)}")
+            return None
+        self.log_pump = LogPump(process.stdout, self._on_jvm_output)
+        threading.Thread(target=self._watch_jar, args=(process, self.log_pump), daemon=True, name="jvm-output").start()
+        return process
+
+    def _watch_jar(self, process, pump):
+        # Výstup JVM se čte po blocích a předává se po dávkách, dokud proces neskončí
+        try:
+            pump.run()
+            process.wait()
+            self.log("Java Jar process terminated.")
+        except Exception as e:
+            self.log(f"Error reading Java Jar output: {str(e)}")
+            return
+        if self.supervisor is not None:
+            self.supervisor.process_exited(process)
+
+    def _check_jar_update(self, updater, current_version):
+        try:
+            version = updater.check_for_update(current_version)
+        except Exception as e:
+            self.log(f"Error checking for .jar updates: {str(e)}")
+            return
+        if version is None:
+            self.log(f".jar file is up to date: {jar_file_name(current_version)}")
+            return
+
+        jar_path = updater.jar_path(version)
+        if JAR_UPDATE_MODE == "prompt" and self.on_update_ready is not None:
+            self.on_update_ready(version, jar_path)
+        else:
+            self.log(f"New .jar version {version} downloaded, restarting miner...")
+            self.restart_java_jar(jar_path)
+
+    def restart_java_jar(self, jar_path=None, restore=True):
+        """Restart JVM; nová JVM začíná bez nastavení, to se pak obnoví na pozadí (restore)."""
+        # Restart volá dohled, auto-tuner, aktualizace i GUI; souběžné restarty by nechaly
+        # běžet JVM, o které controller neví a která drží port
+        with self.process_lock:
+            self.stop_java_process()
+            process = self.launch_jar(self.java_exe, jar_path or self.jar_path)
+        if process is not None and restore:
+            threading.Thread(target=self.restore_settings, daemon=True).start()
+        return process
+
+    def restore_settings(self):
+        """Znovu nastaví peněženku, obtížnost, server a těžbu, které platily před restartem."""
+        settings = dict(self.settings)
+        if not (settings or self.mining):
+            return
+        self.log("Restoring mining settings after restart...")
+        self.apply_mining_settings(
+            settings.get("wallet"), settings.get("difficulty"), settings.get("server"), self.mining
+        )
+
+    def stop_java_process(self):
+        # Záměrně ukončený proces se odpojí, aby ho dohled nepovažoval za pád
+        process = self.java_process
+        self.java_process = None
+        if process and process.poll() is None:
+            process.terminate()  # Požádá proces o ukončení
+            try:
+                process.wait(timeout=5)  # Počká až 5 sekund na ukončení
+            except subprocess.TimeoutExpired:
+                process.kill()  # Pokud proces neodpovídá, násilně ho ukončí
+
+
+FLEET_STATUS_INTERVAL = 60  # s
+# Příkazy flotily ze standardního vstupu: slovo -> (metoda controlleru, počet hodnot)
+FLEET_COMMANDS = {
+    "wallet": ("set_miner", 1),
+    "difficulty": ("set_difficulty", 1),
+    "server": ("change_server", 1),
+    "mine": ("start_mining", 0),
+    "stop": ("stop_mining", 0),
+    "restart": ("restart_java_jar", 0),
+}
+
+
+def prefixed_log(log, prefix):
+    """Log, který před každý řádek přidá jméno instance."""
+    def write(text):
+        log("\n".join(f"[{prefix}] {line}" for line in text.rstrip("\n").splitlines()))
+    return write
+
+
+class FleetController:
+    """
+    Několik JVM minera na jednom stroji. Každá instance má vlastní port (-Dserver.port),
+    pracovní adresář, profil JVM s afinitou k jádrům, peněženku, obtížnost a server.
+    Příkazy jdou na API konkrétní instance, stav se sčítá do společného přehledu.
+    """
+
+    def __init__(self, log, instances):
+        self.log = log
+        self.controllers = []
+        self.settings = {}
+        store = JvmProfileStore()
+        # Paměť v procentech profilu platí pro celou flotilu: dělí se podle připnutých jader,
+        # a když afinitu nemají všechny instance, rovným dílem
+        cores = [len(config.get("affinity") or []) for config in instances]
+        total_cores = sum(cores) if all(cores) else 0
+        for index, config in enumerate(instances):
+            name = config.get("name", f"miner-{index}")
+            port = int(config.get("port", 8082 + index))
+            profile_name = config.get("profile", store.active_name())
+            profile = dict(store.profiles().get(profile_name, {}))
+            if "affinity" in config:
+                profile["affinity"] = config["affinity"]
+            share = cores[index] / total_cores if total_cores else 1 / len(instances)
+            for option in ("xms", "xmx"):
+                if profile.get(option):
+                    profile[option] = scale_memory(profile[option], share)
+            profile["extra_args"] = list(profile.get("extra_args", [])) + [f"-Dserver.port={port}"]
+
+            controller = MinerController(
+                prefixed_log(log, name),
+                api_url=f"http://localhost:{port}",
+                name=name,
+                profile=profile,
+                profile_name=profile_name,
+                workdir=config.get("workdir", os.path.join("fleet", name)),
+            )
+            self.controllers.append(controller)
+            self.settings[name] = config
+        # Aktualizaci jaru hlídá první instance a restartuje pak všechny
+        if self.controllers:
+            self.controllers[0].on_update_ready = self.restart_all
+        self.scheduler = PollScheduler(lambda func: func())
+        self.metrics_server = None
+
+    @classmethod
+    def from_file(cls, log, path):
+        with open(path, "r") as file:
+            return cls(log, json.load(file)["instances"])
+
+    def controller(self, name):
+        for controller in self.controllers:
+            if controller.name == name:
+                return controller
+        raise KeyError(f"Unknown miner instance: {name}")
+
+    def start(self):
+        threading.Thread(target=self._start, daemon=True).start()
+
+    def _start(self):
+        if not self.controllers:
+            self.log("Fleet has no instances.")
+            return
+        first = self.controllers[0]
+        java_exe = first.resolve_java()
+        jar_path = first.resolve_jar() if java_exe else None
+        if jar_path is None:
+            return
+
+        for controller in self.controllers:
+            config = self.settings[controller.name]
+            controller.java_exe = java_exe
+            controller.launch_jar(java_exe, jar_path)
+            if controller.supervisor is not None:
+                controller.supervisor.start()
+            threading.Thread(
+                target=controller.apply_mining_settings,
+                args=(config.get("wallet"), config.get("difficulty"), config.get("server"), config.get("mining")),
+                daemon=True
+            ).start()
+
+        self.scheduler.add("fleet_status", self.status, self._log_status, FLEET_STATUS_INTERVAL,
+                           delay=FLEET_STATUS_INTERVAL)
+        self.scheduler.start()
+
+    def restart_all(self, version, jar_path):
+        self.log(f"New .jar version {version} downloaded, restarting all miners...")
+        for controller in self.controllers:
+            threading.Thread(target=controller.restart_java_jar, args=(jar_path,), daemon=True).start()
+
+    def command(self, name, action, *args):
+        """Zavolá akci (např. "set_difficulty") na API jedné instance."""
+        return getattr(self.controller(name), action)(*args)
+
+    def broadcast(self, action, *args):
+        """Zavolá akci na všech instancích najednou."""
+        with ThreadPoolExecutor(max_workers=len(self.controllers) or 1) as pool:
+            futures = {c.name: pool.submit(getattr(c, action), *args) for c in self.controllers}
+        return {name: future.result() for name, future in futures.items()}
+
+    def status(self):
+        """Společný přehled: stav každé instance a součty."""
+        with ThreadPoolExecutor(max_workers=len(self.controllers) or 1) as pool:
+            instances = list(pool.map(lambda c: c.status(), self.controllers))
+        return {
+            "instances": instances,
+            "alive": sum(1 for i in instances if i["alive"]),
+            "responding": sum(1 for i in instances if i["api_latency"] is not None),
+            "mining": sum(1 for i in instances if i["mining"]),
+            "total": len(instances),
+            "lines_per_sec": sum(i["lines_per_sec"] for i in instances),
+        }
+
+    def _log_status(self, status, error):
+        if error:
+            self.log(f"Fleet status error: {error}")
+            return
+        self.log(
+            f"Fleet: {status['alive']}/{status['total']} running, {status['responding']} responding, "
+            f"{status['mining']} mining"
+        )
+        for i in status["instances"]:
+            latency = f"{i['api_latency'] * 1000:.0f} ms" if i["api_latency"] is not None else "no response"
+            self.log(f"  {i['name']} pid={i['pid']} api={latency} mining={i['mining']}")
+
+    def start_metrics_server(self, port):
+        """Jeden endpoint pro všechny instance (rozlišené labelem instance)."""
+        registries = [controller.metrics for controller in self.controllers]
+        self.metrics_server = MetricsServer(
+            lambda: render_prometheus(registries), lambda: [r.snapshot() for r in registries], port
+        )
+        self.metrics_server.start()
+        self.log(f"Metrics available at http://127.0.0.1:{port}/metrics")
+
+    def shutdown(self):
+        self.scheduler.stop()
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+        # Každá instance se ukončí celá (včetně dopsání úložiště logu JVM), HTTP klient je sdílený
+        for controller in self.controllers:
+            controller.shutdown(close_http=False)
+        http_client.close()
+
+
+def console_logger():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    logger = logging.getLogger("citu")
+
+    def log(text):
+        logger.info(text.rstrip("\n"))
+    return log
+
+
+def wait_for_shutdown():
+    """Blokuje, dokud nepřijde SIGINT/SIGTERM."""
+    stop = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    # Čekání s timeoutem, aby se signály zpracovaly i na Windows
+    while not stop.wait(1):
+        pass
+
+
+def format_command_result(result):
+    if isinstance(result, dict) and "error" in result:
+        return f"error: {result['error']}"
+    return "failed" if result is None else "ok"
+
+
+def read_fleet_commands(fleet, stream, log):
+    """
+    Čte řádky `<instance|all> <příkaz> [hodnota]` (např. `miner-0 difficulty 19`, `all stop`)
+    a posílá je na API instancí; `status` vypíše přehled. Konec vstupu ukončí jen čtení příkazů.
+    """
+    usage = f"<instance|all> {'|'.join(FLEET_COMMANDS)} [value], or status"
+    for line in stream:
+        parts = line.split()
+        if not parts:
+            continue
+        if parts == ["status"]:
+            fleet._log_status(fleet.status(), None)
+            continue
+        if len(parts) < 2 or parts[1] not in FLEET_COMMANDS:
+            log(f"Unknown fleet command '{line.strip()}', use: {usage}")
+            continue
+        target, word, values = parts[0], parts[1], parts[2:]
+        action, arity = FLEET_COMMANDS[word]
+        if len(values) != arity:
+            log(f"Fleet command '{word}' takes {arity} value(s), use: {usage}")
+            continue
+        if word == "difficulty" and not values[0].isdigit():
+            log(f"Difficulty must be a number, not '{values[0]}'")
+            continue
+        try:
+            if target == "all":
+                results = fleet.broadcast(action, *values)
+            else:
+                results = {target: fleet.command(target, action, *values)}
+        except KeyError as e:
+            log(str(e.args[0]))
+            continue
+        for name, result in results.items():
+            log(f"[{name}] {word}: {format_command_result(result)}")
+
+
+def run_fleet(args):
+    """Spustí flotilu instancí podle konfiguračního souboru a běží do SIGINT/SIGTERM."""
+    log = console_logger()
+    try:
+        fleet = FleetController.from_file(log, args.fleet)
+    except Exception as e:
+        log(f"Error loading fleet configuration {args.fleet}: {e}")
+        return 1
+    if args.metrics_port:
+        try:
+            fleet.start_metrics_server(args.metrics_port)
+        except OSError as e:
+            log(f"Error starting metrics endpoint on port {args.metrics_port}: {e}")
+    fleet.start()
+    if sys.stdin is not None and not sys.stdin.closed:
+        threading.Thread(target=read_fleet_commands, args=(fleet, sys.stdin, log), daemon=True).start()
+    wait_for_shutdown()
+    log("Shutting down...")
+    fleet.shutdown()
+    return 0
+
+
+def run_headless(args):
+    """Spustí minera bez GUI a běží, dokud nepřijde SIGINT/SIGTERM."""
+    log = console_logger()
+
+    last_status = {}
+
+    def log_update(name, value, error):
+        # Do logu jen změny, ať se každých 10 s neopakuje totéž
+        status = f"Error: {error}" if error else value
+        if name in ("nodes", "metrics", "actions", "sync", "autotune", "supervisor") or last_status.get(name) == status:
+            return
+        last_status[name] = status
+        log(f"{name}: {status}")
+
+    controller = MinerController(log, metrics_port=args.metrics_port)
+    controller.add_listener(log_update)
+    profiler = SamplingProfiler() if args.profile else None
+    if profiler is not None:
+        profiler.start()
+
+    controller.start(poll=not args.no_poll)
+    controller.startup.mark("headless controller ready")
+    if args.wallet or args.difficulty or args.server or args.mine or args.autotune:
+        def apply_settings():
+            controller.apply_mining_settings(args.wallet, args.difficulty, args.server, args.mine)
+            if args.autotune:
+                controller.set_autotune(True)
+        threading.Thread(target=apply_settings, daemon=True).start()
+
+    wait_for_shutdown()
+    log("Shutting down...")
+    controller.shutdown()
+    if args.diagnostics:
+        if profiler is not None:
+            profiler.stop()
+        try:
+            diagnostics.export(args.diagnostics, profiler)
+            log(f"Diagnostics exported to {args.diagnostics}")
+        except OSError as e:
+            log(f"Error exporting diagnostics: {e}")
+    return 0
+
+
+def run_payout(args):
+    """Hromadná výplata podle souboru přes API již běžícího minera."""
+    log = console_logger()
+    if not args.sender:
+        log("--sender is required for --payout")
+        return 1
+    password = os.environ.get("CITU_PAYOUT_PASSWORD") or getpass.getpass("Sender password: ")
+    controller = MinerController(log)
+    if not controller.wait_for_api(timeout=10):
+        log(f"Miner API at {controller.api_url} is not reachable; start the miner first.")
+        return 1
+    try:
+        summary = controller.pay_out(
+            args.payout, args.sender, password, concurrency=args.concurrency, rate=args.rate,
+            retry_failed=args.retry_failed
+        )
+    except Exception as e:
+        log(f"Error running payout {args.payout}: {e}")
+        return 1
+    finally:
+        controller.actions.shutdown()
+        http_client.close()
+    return 0 if not summary.get("failed") and not summary.get("unknown") else 2
+
+
+def run_log_search(args):
+    """Hledání v uloženém výstupu JVM z příkazové řádky, výsledky od nejstarších."""
+    store = LogStore(args.log_store)
+    if not os.path.exists(store.path):
+        print(f"No JVM log store at {store.path}", file=sys.stderr)
+        return 1
+    level = LOG_LEVELS[args.level] if args.level else None
+    since = time.time() - args.since * 3600 if args.since else None
+    rows = store.search(args.search_logs, level, since, limit=args.limit)
+    for row in reversed(rows):
+        print(format_log_row(row))
+    return 0
@@ -0,0 +1,1308 @@
+import collections
+import functools
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+import tkinter as tk
+from tkinter import filedialog, messagebox
+
+import customtkinter as ctk
+
+from CITU_engine import (
+    DECIMAL_PATTERN, LOG_LEVELS, LOG_SEARCH_LIMIT, SYNC_AUTO_RESOLVE, MinerController, SamplingProfiler,
+    diagnostics, format_diagnostics, format_log_row, format_sync_state, format_tune_result, redact_password
+)
+
+# Inicializace stylu
+ctk.set_appearance_mode("light")  # Světlý režim, možnost 'dark' pro tmavý
+ctk.set_default_color_theme("blue")  # Hlavní barvy
+
+
+def set_textbox(widget, text):
+    """Přepíše obsah needitovatelného textového pole."""
+    widget.configure(state="normal")
+    widget.delete("1.0", tk.END)
+    widget.insert("1.0", text)
+    widget.configure(state="disabled")
+
+
+# Nejkratší odstup mezi dvěma překresleními z fronty (cca jeden snímek)
+UI_FRAME_INTERVAL = 16  # ms
+DIAGNOSTICS_REFRESH_INTERVAL = 2000  # ms
+
+# Časová okna pro hledání v uloženém výstupu JVM (None = celá historie)
+LOG_SEARCH_PERIODS = {"Last hour": 3600, "Last 24 hours": 86400, "Last 7 days": 7 * 86400, "All": None}
+
+# Cíl pro zobrazení okna od spuštění programu; překročení se zaloguje jako varování
+STARTUP_TARGET = 1.5  # s
+# Odklad startu engine (JVM, dotazy, síť), aby se nejdřív vykreslilo okno
+ENGINE_START_DELAY = 50  # ms
+
+# Záložky, které se staví až při prvním otevření, a události engine, které do nich patří
+LAZY_TABS = ("Wallet&Server", "Mining", "Staking&Unstaking", "Sending Coins", "Create Account", "Logs",
+             "Diagnostics")
+UPDATE_TABS = {"account_file": "Wallet&Server", "nodes": "Wallet&Server", "server": "Wallet&Server",
+               "autotune": "Mining"}
+
+
+def callback_name(item):
+    """Jméno callbacku pro diagnostiku, u partial(on_engine_update, "balances", ...) včetně události."""
+    func = getattr(item, "func", item)
+    name = getattr(func, "__qualname__", type(func).__name__)
+    args = getattr(item, "args", ())
+    if args and isinstance(args[0], str):
+        name = f"{name}({args[0]})"
+    return name
+
+
+class UiDispatcher:
+    """
+    Fronta zpráv pro GUI s buzením na požádání místo neustálého dotazování.
+    Producenti z libovolného vlákna volají put(); první zpráva do prázdné fronty vygeneruje
+    virtuální událost Tk, hlavní vlákno pak najednou zpracuje vše, co čeká.
+    Text se vkládá jedním voláním, callable položky se zavolají v hlavním vlákně.
+    """
+
+    EVENT = "<<UiDispatch>>"
+
+    def __init__(self, widget, write_text):
+        self.widget = widget
+        self.write_text = write_text
+        self.items = collections.deque()
+        self.lock = threading.Lock()
+        self.wakeup_pending = False
+        self.last_drain = 0.0
+        self.wakeups = 0
+        self.idle_wakeups = 0
+        self.items_processed = 0
+        self.max_depth = 0
+        widget.bind(self.EVENT, self._on_wakeup)
+        # Zprávy vzniklé před spuštěním mainloop se zpracují při prvním průchodu smyčkou
+        widget.after_idle(self._drain)
+
+    def put(self, item):
+        with self.lock:
+            self.items.append(item)
+            self.max_depth = max(self.max_depth, len(self.items))
+            if self.wakeup_pending:
+                return
+            self.wakeup_pending = True
+        try:
+            self.widget.event_generate(self.EVENT, when="tail")
+        except (RuntimeError, tk.TclError):
+            # Mainloop ještě neběží nebo je okno zavřené - zprávy vyzvedne after_idle
+            with self.lock:
+                self.wakeup_pending = False
+
+    def _on_wakeup(self, event=None):
+        # Nejvýš jedno vyprázdnění fronty za snímek
+        wait = UI_FRAME_INTERVAL - (time.perf_counter() - self.last_drain) * 1000
+        if wait > 0:
+            self.widget.after(int(wait) + 1, self._drain)
+        else:
+            self._drain()
+
+    def _drain(self):
+        with self.lock:
+            batch = list(self.items)
+            self.items.clear()
+            self.wakeup_pending = False
+        self.last_drain = time.perf_counter()
+        self.wakeups += 1
+        if not batch:
+            self.idle_wakeups += 1
+            return
+        self.items_processed += len(batch)
+
+        lines = []
+        for item in batch:
+            if callable(item):
+                if lines:
+                    self._write(lines)
+                    lines = []
+                # Chyba jednoho callbacku nesmí zahodit zbytek dávky (ani další text do konzole)
+                try:
+                    with diagnostics.timed("tk", callback_name(item)):
+                        item()
+                except Exception as e:
+                    logging.getLogger("citu").exception("UI callback %s failed", callback_name(item))
+                    lines.append(f"Error in {callback_name(item)}: {e}\n")
+            else:
+                lines.append(item if item.endswith("\n") else item + "\n")
+        if lines:
+            self._write(lines)
+
+    def _write(self, lines):
+        with diagnostics.timed("tk", "console write"):
+            self.write_text("".join(lines))
+
+    def metrics(self):
+        with self.lock:
+            depth = len(self.items)
+        return {
+            "wakeups": self.wakeups,
+            "idle_wakeups": self.idle_wakeups,
+            "items": self.items_processed,
+            "queue_depth": depth,
+            "max_queue_depth": self.max_depth,
+        }
+
+
+# Konzole drží v okně jen posledních CONSOLE_MAX_LINES řádků, celá historie jde do rotovaného logu
+CONSOLE_MAX_LINES = 5000
+CONSOLE_REFRESH_INTERVAL = 250  # ms
+CONSOLE_LOG_FILE = "citu_console.log"
+CONSOLE_LOG_MAX_BYTES = 10 * 1024 * 1024
+CONSOLE_LOG_BACKUPS = 5
+
+
+class ConsoleBuffer:
+    """
+    Omezená konzole nad CTkTextbox.
+    Nové řádky se hromadí v kruhovém bufferu a vykreslují se několikrát za sekundu najednou,
+    starší řádky se z okna odmazávají shora. Pokud uživatel odscrolloval nahoru,
+    automatický posun na konec se pozastaví. Kompletní výstup se zapisuje na disk
+    do rotovaného logu (zápis probíhá ve vedlejším vlákně).
+    """
+
+    def __init__(self, textbox, max_lines=CONSOLE_MAX_LINES, refresh_interval=CONSOLE_REFRESH_INTERVAL,
+                 log_file=CONSOLE_LOG_FILE):
+        self.textbox = textbox
+        self.max_lines = max_lines
+        self.refresh_interval = refresh_interval
+        self.pending = collections.deque(maxlen=max_lines)
+        self.dropped = 0
+        self.render_job = None
+        self.log_listener = None
+        self.logger = logging.getLogger("citu.console")
+        self.logger.propagate = False
+        if log_file:
+            self._setup_log(log_file)
+
+    def _setup_log(self, log_file):
+        try:
+            handler = logging.handlers.RotatingFileHandler(
+                log_file, maxBytes=CONSOLE_LOG_MAX_BYTES, backupCount=CONSOLE_LOG_BACKUPS, encoding="utf-8"
+            )
+        except OSError:
+            return
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        log_queue = queue.SimpleQueue()
+        self.logger.handlers = [logging.handlers.QueueHandler(log_queue)]
+        self.logger.setLevel(logging.INFO)
+        self.log_listener = logging.handlers.QueueListener(log_queue, handler)
+        self.log_listener.start()
+
+    def write(self, text):
+        """Přidá text do konzole (volá se v hlavním vlákně)."""
+        lines = text.splitlines()
+        if not lines:
+            return
+        if self.log_listener is not None:
+            for line in lines:
+                self.logger.info(line)
+        overflow = len(self.pending) + len(lines) - self.max_lines
+        if overflow > 0:
+            self.dropped += overflow
+        self.pending.extend(lines)
+        if self.render_job is None:
+            self.render_job = self.textbox.after(self.refresh_interval, self.flush)
+
+    def flush(self):
+        self.render_job = None
+        if not self.pending:
+            return
+        with diagnostics.timed("tk", "console render"):
+            self._render()
+
+    def _render(self):
+        lines = list(self.pending)
+        self.pending.clear()
+
+        # Automatický posun jen pokud je uživatel na konci výpisu
+        follow = self.textbox.yview()[1] >= 0.999
+        if len(lines) >= self.max_lines:
+            self.textbox.delete("1.0", tk.END)
+        self.textbox.insert(tk.END, "\n".join(lines) + "\n")
+
+        # Odmazání nejstarších řádků nad limit
+        line_count = int(self.textbox.index("end-1c").split(".")[0]) - 1
+        excess = line_count - self.max_lines
+        if excess > 0:
+            self.textbox.delete("1.0", f"{excess + 1}.0")
+        if follow:
+            self.textbox.see(tk.END)
+
+    def close(self):
+        if self.render_job is not None:
+            self.textbox.after_cancel(self.render_job)
+            self.render_job = None
+        if self.log_listener is not None:
+            self.log_listener.stop()
+            self.log_listener = None
+
+
+class Application(ctk.CTk):
+    def __init__(self, started=None):
+        super().__init__()
+
+        # Nastavení okna
+        self.title("Welcome to the future with CITU")
+        self.geometry("900x900")
+        self.configure(fg_color="#B0B0B0")
+
+        self.queue = UiDispatcher(self, self.update_console)
+
+        # Veškerou logiku minera obstarává MinerController, GUI se k němu jen připojuje
+        self.engine = MinerController(
+            log=self.queue.put,
+            post=self.queue.put,
+            on_update_ready=lambda version, jar_path: self.queue.put(
+                lambda: self.prompt_jar_restart(version, jar_path)
+            ),
+        )
+        self.engine.add_listener(self.on_engine_update)
+        self.jvm_profiles = self.engine.jvm_profiles
+        self.startup = self.engine.startup
+        if started is not None:
+            self.startup.started = started
+        self.startup.begin("widget build")
+        self.profiler = SamplingProfiler()
+
+        # Hlavní notebook pro záložky
+        self.notebook = ctk.CTkTabview(self, width=850, height=100, command=self.on_tab_change)
+        self.notebook.pack(pady=10, padx=10, fill="both", expand=True)
+
+        self.notebook.add("Info")
+        for name in LAZY_TABS:
+            self.notebook.add(name)
+
+        # Hned se staví jen výchozí záložka, ostatní při prvním otevření
+        self.create_info_tab()
+        self.tab_builders = {
+            "Wallet&Server": self.create_wallet_tab,
+            "Mining": self.create_mining_tab,
+            "Staking&Unstaking": self.create_staking_tab,
+            "Sending Coins": self.create_send_coin_tab,
+            "Create Account": self.create_create_account_tab,
+            "Logs": self.create_logs_tab,
+            "Diagnostics": self.create_diagnostics_tab,
+        }
+        self.built_tabs = {"Info"}
+        self.deferred_updates = {}
+
+        # Počet čekajících a běžících akcí, možnost je zrušit
+        actions_frame = ctk.CTkFrame(self, fg_color="#B0B0B0")
+        actions_frame.pack(fill="x", padx=10)
+        self.actions_label = ctk.CTkLabel(actions_frame, text="Actions: 0 queued, 0 running", text_color="#1A1A1A")
+        self.actions_label.pack(side="left", padx=5)
+        cancel_actions_button = ctk.CTkButton(actions_frame, text="Cancel Actions", command=self.cancel_actions)
+        cancel_actions_button.pack(side="right", padx=5)
+
+        # Konzole pro zobrazení výstupů
+        self.console = ctk.CTkTextbox(self, wrap=tk.WORD, height=500, width=500, fg_color="black", text_color="white")
+        self.console.pack(fill="both", expand=True, padx=10, pady=10)
+        self.console_buffer = ConsoleBuffer(self.console)
+        self.startup.end("widget build")
+
+        # Automatické procesy až po prvním vykreslení okna
+        self.after_idle(self.startup.mark, "first frame", STARTUP_TARGET)
+        self.after(ENGINE_START_DELAY, self.engine.start)
+
+        # Zajistí správné zavření aplikace
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    def create_info_tab(self):
+        # Vytvoření záložky
+        info_tab = self.notebook.tab("Info")
+
+        # Hlavní rám pro záložku
+        info_frame = ctk.CTkFrame(info_tab, fg_color="#B0B0B0")
+        info_frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+        # Textové pole pro lokální bloky
+        local_info_label = ctk.CTkLabel(info_frame, text="Blockchain Info:", text_color="#1A1A1A")
+        local_info_label.grid(row=0, column=1, padx=5, pady=5, sticky="")
+
+        self.local_info = ctk.CTkTextbox(info_frame, height=1, width=200, fg_color="white", text_color="black")
+        self.local_info.grid(row=1, column=1, padx=10, pady=5, sticky="w")
+        self.local_info.insert("1.0", "Local blocks: N/A")
+        self.local_info.configure(state="disabled")  # Zamezení editace
+
+        # Textové pole pro globální bloky
+        self.global_info = ctk.CTkTextbox(info_frame, height=1, width=200, fg_color="white", text_color="black")
+        self.global_info.grid(row=2, column=1, padx=10, pady=5, sticky="w")
+        self.global_info.insert("1.0", "Global blocks: N/A")
+        self.global_info.configure(state="disabled")  # Zamezení editace
+
+        # Tlačítko pro aktualizaci blockchainu
+        update_blockchain_button = ctk.CTkButton(
+            info_frame, text="Update Blockchain", command=self.update_blockchain, fg_color="#1E1E1E", text_color="white"
+        )
+        update_blockchain_button.grid(row=3, column=1, padx=10, pady=5, sticky="")
+
+        # Prázdná mezera mezi sloupci
+        spacer = ctk.CTkLabel(info_frame, text="", width=200)  # Prázdný widget jako mezera
+        spacer.grid(row=0, column=2, rowspan=4)  # Zabereme prostor mezi column=1 a column=3
+
+        # Dollar Balance Label
+        dollar_balance_label = ctk.CTkLabel(
+            info_frame, text="Dollar Balance:", text_color="#1A1A1A"
+        )
+        dollar_balance_label.grid(row=0, column=2, padx=10, pady=5, sticky="e")
+
+        # Dollar Balance Textbox
+        self.dollar_balance_info = ctk.CTkTextbox(
+            info_frame, height=30, width=400, fg_color="white", text_color="black"
+        )
+        self.dollar_balance_info.grid(row=0, column=3, padx=10, pady=5, sticky="e")
+        self.dollar_balance_info.insert("1.0", "Dollar Balance: N/A")
+        self.dollar_balance_info.configure(state="disabled")  # Zamezení editace
+
+        # Stock Balance Label
+        stock_balance_label = ctk.CTkLabel(
+            info_frame, text="Stock Balance:", text_color="#1A1A1A"
+        )
+        stock_balance_label.grid(row=1, column=2, padx=10, pady=5, sticky="e")
+
+        # Stock Balance Textbox
+        self.stock_balance_info = ctk.CTkTextbox(
+            info_frame, height=30, width=400, fg_color="white", text_color="black"
+        )
+        self.stock_balance_info.grid(row=1, column=3, padx=10, pady=5, sticky="e")
+        self.stock_balance_info.insert("1.0", "Stock Balance: N/A")
+        self.stock_balance_info.configure(state="disabled")  # Zamezení editace
+
+        # Staking Balance Label
+        staking_balance_label = ctk.CTkLabel(
+            info_frame, text="Staking Balance:", text_color="#1A1A1A"
+        )
+        staking_balance_label.grid(row=2, column=2, padx=10, pady=5, sticky="e")
+
+        # Staking Balance Textbox
+        self.staking_balance_info = ctk.CTkTextbox(
+            info_frame, height=30, width=400, fg_color="white", text_color="black"
+        )
+        self.staking_balance_info.grid(row=2, column=3, padx=10, pady=5, sticky="e")
+        self.staking_balance_info.insert("1.0", "Staking Balance: N/A")
+        self.staking_balance_info.configure(state="disabled")  # Zamezení editace
+
+        # Refresh Button
+        refresh_combined_button = ctk.CTkButton(
+            info_frame, text="Refresh Balance", command=self.refresh_combined_info, fg_color="#1E1E1E",
+            text_color="white"
+        )
+        refresh_combined_button.grid(row=3, column=3, padx=10, pady=5, sticky="")
+
+        # Metriky z výstupu minera
+        self.mining_stats_info = ctk.CTkTextbox(info_frame, height=1, width=200, fg_color="white", text_color="black")
+        self.mining_stats_info.grid(row=4, column=1, padx=10, pady=5, sticky="w")
+        self.mining_stats_info.insert("1.0", "Hashrate: N/A")
+        self.mining_stats_info.configure(state="disabled")  # Zamezení editace
+
+        self.blocks_stats_info = ctk.CTkTextbox(info_frame, height=1, width=200, fg_color="white", text_color="black")
+        self.blocks_stats_info.grid(row=5, column=1, padx=10, pady=5, sticky="w")
+        self.blocks_stats_info.insert("1.0", "Blocks found: 0 / rejected: 0")
+        self.blocks_stats_info.configure(state="disabled")  # Zamezení editace
+
+        # Zpoždění za sítí a automatická aktualizace blockchainu
+        self.sync_info = ctk.CTkTextbox(info_frame, height=1, width=300, fg_color="white", text_color="black")
+        self.sync_info.grid(row=6, column=1, padx=10, pady=5, sticky="w")
+        self.sync_info.insert("1.0", "Sync: N/A")
+        self.sync_info.configure(state="disabled")  # Zamezení editace
+
+        self.auto_resolve_var = tk.BooleanVar(value=SYNC_AUTO_RESOLVE)
+        auto_resolve_checkbox = ctk.CTkCheckBox(
+            info_frame, text="Auto update blockchain", variable=self.auto_resolve_var,
+            command=self.toggle_auto_resolve, text_color="#1A1A1A"
+        )
+        auto_resolve_checkbox.grid(row=7, column=1, padx=10, pady=5, sticky="w")
+
+    def create_wallet_tab(self):
+        # Vytvoření záložky Wallet&Server
+        frame = ctk.CTkFrame(self.notebook.tab("Wallet&Server"), fg_color="#B0B0B0")
+        frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+        # Wallet Address Label
+        wallet_label = ctk.CTkLabel(frame, text="Add/Change Wallet Address:", text_color="#1A1A1A")
+        wallet_label.grid(row=0, column=0, padx=5, pady=5, sticky="w")
+
+        # Wallet Address Entry
+        self.wallet_entry = ctk.CTkEntry(frame, width=350)
+        self.wallet_entry.grid(row=0, column=1, padx=5, pady=5, sticky="w")
+
+        # Confirm Button
+        confirm_button = ctk.CTkButton(
+            frame, text="Confirm", command=self.confirm_wallet_address, fg_color="#1E1E1E", text_color="white"
+        )
+        confirm_button.grid(row=0, column=2, padx=5, pady=5, sticky="w")
+
+        # Miner Account Info Text
+        miner_account_label = ctk.CTkLabel(frame, text="Chosen wallet Info:", text_color="#1A1A1A")
+        miner_account_label.grid(row=2, column=0, padx=5, pady=5, sticky="w")
+
+        self.miner_account_info = ctk.CTkTextbox(frame, height=30, width=350, fg_color="white", text_color="black")
+        self.miner_account_info.grid(row=2, column=1, padx=5, pady=5, sticky="w")
+        self.miner_account_info.insert("0.0", "Miner account info will be displayed here.")
+        self.miner_account_info.configure(state="disabled")  # Zamezení editace
+
+        # Refresh Button
+        refresh_button = ctk.CTkButton(
+            frame, text="Refresh", command=self.refresh_miner_account_info, fg_color="#1E1E1E", text_color="white"
+        )
+        refresh_button.grid(row=2, column=2, padx=5, pady=5, sticky="w")
+
+        # Choose Server Label
+        server_label = ctk.CTkLabel(frame, text="Choose Server:", text_color="#1A1A1A")
+        server_label.grid(row=4, column=0, padx=5, pady=5, sticky="w")
+
+        # Server Combobox - nejdřív z cache na disku, čerstvý seznam stáhne engine na pozadí
+        nodes = self.engine.known_nodes
+        self.host_entry = ctk.CTkComboBox(frame, values=nodes, width=350)
+        self.host_entry.grid(row=4, column=1, padx=5, pady=5, sticky="w")
+        if not nodes:
+            self.host_entry.set("")
+
+        # Change Server Button
+        change_server_button = ctk.CTkButton(
+            frame, text="Change your server", command=self.change_server, fg_color="#1E1E1E", text_color="white"
+        )
+        change_server_button.grid(row=4, column=2, padx=5, pady=5, sticky="w")
+
+        # Tlačítko pro otestování a seřazení serverů podle odezvy
+        probe_button = ctk.CTkButton(
+            frame, text="Rank servers", command=self.probe_servers, fg_color="#1E1E1E", text_color="white"
+        )
+        probe_button.grid(row=5, column=1, padx=5, pady=5, sticky="w")
+
+        # Automatický výběr nejrychlejšího synchronizovaného serveru
+        self.auto_server_var = tk.BooleanVar(value=False)
+        auto_server_checkbox = ctk.CTkCheckBox(
+            frame, text="Auto-select fastest in-sync server", variable=self.auto_server_var,
+            command=self.toggle_auto_server, text_color="#1A1A1A"
+        )
+        auto_server_checkbox.grid(row=5, column=1, padx=5, pady=5, sticky="e")
+
+    def create_mining_tab(self):
+        # Vytvoření záložky Mining
+        frame = ctk.CTkFrame(self.notebook.tab("Mining"), fg_color="#B0B0B0")
+        frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+        # Štítek pro nastavení obtížnosti
+        difficulty_label = ctk.CTkLabel(frame, text="Mining Difficulty:", text_color="#1A1A1A")
+        difficulty_label.grid(row=0, column=0, padx=5, pady=5, sticky="w")
+
+        # Rozevírací menu s možností rolování
+        self.difficulty_option_menu = ctk.CTkOptionMenu(
+            frame,
+            values=[str(i) for i in range(17, 100)],  # Hodnoty pro výběr
+            width=50,
+            fg_color="white",
+            text_color="black"
+        )
+        self.difficulty_option_menu.grid(row=0, column=1, padx=5, pady=5, sticky="w")
+        self.difficulty_option_menu.set("17")  # Výchozí hodnota
+
+        # Tlačítko pro potvrzení obtížnosti
+        confirm_button_difficulty = ctk.CTkButton(
+            frame, text="Confirm", command=self.confirm_difficulty, fg_color="#1E1E1E", text_color="white"
+        )
+        confirm_button_difficulty.grid(row=0, column=2, padx=5, pady=5, sticky="w")
+
+        # Spacer pro oddělení widgetů
+        spacer = ctk.CTkLabel(frame, text="", width=1, height=30)  # Prázdný widget jako mezera
+        spacer.grid(row=1, column=0, columnspan=3)
+
+        # Tlačítko pro spuštění těžby
+        start_button = ctk.CTkButton(
+            frame, text="Start Mining", command=self.start_mining, fg_color="#1E1E1E", text_color="white"
+        )
+        start_button.grid(row=2, column=0, padx=5, pady=5, sticky="w")
+
+        # Tlačítko pro zastavení těžby
+        stop_button = ctk.CTkButton(
+            frame, text="Stop Mining", command=self.stop_mining, fg_color="#1E1E1E", text_color="white"
+        )
+        stop_button.grid(row=2, column=2, padx=5, pady=5, sticky="e")
+
+        # Výběr profilu ladění JVM pro tento stroj
+        profile_label = ctk.CTkLabel(frame, text="JVM Profile:", text_color="#1A1A1A")
+        profile_label.grid(row=3, column=0, padx=5, pady=5, sticky="w")
+
+        self.jvm_profile_menu = ctk.CTkOptionMenu(
+            frame,
+            values=list(self.jvm_profiles.profiles()),
+            width=120,
+            fg_color="white",
+            text_color="black"
+        )
+        self.jvm_profile_menu.grid(row=3, column=1, padx=5, pady=5, sticky="w")
+        self.jvm_profile_menu.set(self.jvm_profiles.active_name())
+
+        apply_profile_button = ctk.CTkButton(
+            frame, text="Apply", command=self.apply_jvm_profile, fg_color="#1E1E1E", text_color="white"
+        )
+        apply_profile_button.grid(row=3, column=2, padx=5, pady=5, sticky="w")
+
+        # Automatické ladění obtížnosti podle naměřeného výnosu
+        self.autotune_var = tk.BooleanVar(value=False)
+        autotune_checkbox = ctk.CTkCheckBox(
+            frame, text="Auto-tune difficulty", variable=self.autotune_var,
+            command=self.toggle_autotune, text_color="#1A1A1A"
+        )
+        autotune_checkbox.grid(row=4, column=0, padx=5, pady=5, sticky="w")
+
+        self.autotune_info = ctk.CTkLabel(frame, text="", text_color="#1A1A1A")
+        self.autotune_info.grid(row=4, column=1, columnspan=2, padx=5, pady=5, sticky="w")
+
+    def create_staking_tab(self):
+        # Vytvoření záložky Staking&Unstaking
+        frame = ctk.CTkFrame(self.notebook.tab("Staking&Unstaking"), fg_color="#B0B0B0")
+        frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+        # Štítky pro zadání údajů
+        staking_address_label = ctk.CTkLabel(frame, text="Address:", text_color="#1A1A1A")
+        staking_address_label.grid(row=0, column=0, padx=5, pady=5, sticky="w")
+
+        staking_amount_label = ctk.CTkLabel(frame, text="Dollar:", text_color="#1A1A1A")
+        staking_amount_label.grid(row=1, column=0, padx=5, pady=5, sticky="w")
+
+        staking_password_label = ctk.CTkLabel(frame, text="Password:", text_color="#1A1A1A")
+        staking_password_label.grid(row=2, column=0, padx=5, pady=5, sticky="w")
+
+        # Vstupní pole pro zadání adresy
+        self.staking_address_entry = ctk.CTkEntry(frame, width=350, fg_color="white", text_color="black")
+        self.staking_address_entry.grid(row=0, column=1, padx=5, pady=5, sticky="w")
+
+        # Registrace validace
+        validate_command = self.register(self.validate_decimal)
+
+        # Vstupní pole pro zadání částky
+        self.staking_amount_entry = ctk.CTkEntry(
+            frame,
+            width=350,
+            fg_color="white",
+            text_color="black",
+            validate="key",
+            validatecommand=(validate_command, "%P")  # Volání validace
+        )
+        self.staking_amount_entry.grid(row=1, column=1, padx=5, pady=5, sticky="w")
+
+        # Vstupní pole pro heslo (skryté znaky)
+        self.staking_password_entry = ctk.CTkEntry(frame, width=350, fg_color="white", text_color="black", show="*")
+        self.staking_password_entry.grid(row=2, column=1, padx=5, pady=5, sticky="w")
+
+        # Přidání tlačítka Show pro zobrazení hesla
+        show_password_button = ctk.CTkButton(
+            frame,
+            text="Show",
+            command=lambda: self.toggle_password(self.staking_password_entry),  # Předání konkrétního pole
+            fg_color="#1E1E1E",
+            text_color="white",
+            width=70
+        )
+        show_password_button.grid(row=2, column=2, padx=5, pady=5, sticky="w")
+
+        # Tlačítko pro staking
+        staking_button = ctk.CTkButton(
+            frame, text="Stake", command=self.staking_action, fg_color="#1E1E1E", text_color="white"
+        )
+        staking_button.grid(row=3, column=1, padx=5, pady=5, sticky="w")
+
+        # Tlačítko pro unstaking
+        unstaking_button = ctk.CTkButton(
+            frame, text="Unstake", command=self.unstaking_action, fg_color="#1E1E1E", text_color="white"
+        )
+        unstaking_button.grid(row=3, column=1, padx=5, pady=5, sticky="e")
+
+    def create_send_coin_tab(self):
+        # Vytvoření záložky Sending Coins
+        frame = ctk.CTkFrame(self.notebook.tab("Sending Coins"), fg_color="#B0B0B0")
+        frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+        # Seznam popisků polí
+        labels = ["Sender", "Recipient", "Dollar", "Stock", "Reward", "Password"]
+        self.entries = {}
+
+        # Registrace validace pro použití s Entry widgetem
+        validate_command = self.register(self.validate_decimal)
+
+        # Vytvoření polí a tlačítek
+        for idx, label in enumerate(labels):
+            # Štítky
+            ctk.CTkLabel(frame, text=label, text_color="#1A1A1A").grid(row=idx, column=0, padx=5, pady=5, sticky="w")
+
+            # Vstupní pole
+            entry = ctk.CTkEntry(frame, width=350, fg_color="white", text_color="black")
+
+            # Validace pro pole Dollar, Stock a Reward
+            if label in ["Dollar", "Stock", "Reward"]:
+                entry.insert(0, "0.0")
+                entry.configure(validate="key", validatecommand=(validate_command, "%P"))
+
+            # Nastavení pole pro heslo
+            if label == "Password":
+                entry.configure(show="*")
+
+            entry.grid(row=idx, column=1, padx=5, pady=5, sticky="w")
+            self.entries[label.lower()] = entry
+
+            # Tlačítko pro zobrazení hesla
+            if label == "Password":
+                show_password_button = ctk.CTkButton(
+                    frame,
+                    text="Show",
+                    command=lambda e=entry: self.toggle_password(e),  # Předání konkrétního widgetu
+                    fg_color="#1E1E1E",
+                    text_color="white",
+                    width=70
+                )
+                show_password_button.grid(row=idx, column=2, padx=5, pady=5, sticky="w")
+
+        # Tlačítko pro odeslání transakce
+        send_button = ctk.CTkButton(
+            frame, text="Send Coins", command=self.send_coin, fg_color="#1E1E1E", text_color="white"
+        )
+        send_button.grid(row=len(labels), column=1, padx=5, pady=5, sticky="w")
+
+        # Hromadná výplata ze souboru (odesílatel a heslo z polí výše)
+        payout_button = ctk.CTkButton(
+            frame, text="Batch Payout...", command=self.batch_payout, fg_color="#1E1E1E", text_color="white"
+        )
+        payout_button.grid(row=len(labels) + 1, column=1, padx=5, pady=5, sticky="w")
+
+    def create_logs_tab(self):
+        # Hledání v uloženém výstupu JVM podle textu, úrovně a času, po stránkách od nejnovějších
+        frame = ctk.CTkFrame(self.notebook.tab("Logs"), fg_color="#B0B0B0")
+        frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+        self.log_search_entry = ctk.CTkEntry(
+            frame, width=300, fg_color="white", text_color="black", placeholder_text="Text (word prefixes)"
+        )
+        self.log_search_entry.grid(row=0, column=0, padx=5, pady=5, sticky="w")
+        self.log_search_entry.bind("<Return>", lambda event: self.search_logs())
+
+        self.log_level_menu = ctk.CTkOptionMenu(
+            frame, values=["Any", "ERROR", "WARN", "INFO", "DEBUG"], width=90, fg_color="white", text_color="black"
+        )
+        self.log_level_menu.grid(row=0, column=1, padx=5, pady=5, sticky="w")
+
+        self.log_period_menu = ctk.CTkOptionMenu(
+            frame, values=list(LOG_SEARCH_PERIODS), width=130, fg_color="white", text_color="black"
+        )
+        self.log_period_menu.grid(row=0, column=2, padx=5, pady=5, sticky="w")
+        self.log_period_menu.set("Last 24 hours")
+
+        search_button = ctk.CTkButton(
+            frame, text="Search", command=self.search_logs, fg_color="#1E1E1E", text_color="white", width=80
+        )
+        search_button.grid(row=0, column=3, padx=5, pady=5, sticky="w")
+
+        older_button = ctk.CTkButton(
+            frame, text="Older", command=lambda: self.search_logs(older=True),
+            fg_color="#1E1E1E", text_color="white", width=80
+        )
+        older_button.grid(row=0, column=4, padx=5, pady=5, sticky="w")
+
+        self.log_search_info = ctk.CTkLabel(frame, text="", text_color="#1A1A1A")
+        self.log_search_info.grid(row=1, column=0, columnspan=5, padx=5, sticky="w")
+
+        self.log_search_text = ctk.CTkTextbox(
+            frame, height=300, width=800, fg_color="white", text_color="black", font=("Courier", 12), wrap="none"
+        )
+        self.log_search_text.grid(row=2, column=0, columnspan=5, padx=5, pady=5, sticky="nsew")
+        self.log_search_text.configure(state="disabled")  # Zamezení editace
+        self.log_search_oldest = None
+
+    def search_logs(self, older=False):
+        # "Older" pokračuje od nejstaršího zobrazeného řádku se stejnými filtry
+        before = self.log_search_oldest if older else None
+        if older and before is None:
+            return
+        period = LOG_SEARCH_PERIODS[self.log_period_menu.get()]
+        since = time.time() - period if period else None
+        self.run_action(
+            "Log search", self.engine.search_logs, self.log_search_entry.get(),
+            LOG_LEVELS.get(self.log_level_menu.get()), since, None, LOG_SEARCH_LIMIT, before,
+            callback=functools.partial(self.show_log_search, time.perf_counter())
+        )
+
+    def show_log_search(self, started, rows, error):
+        if error:
+            self.update_console(f"Error searching JVM logs: {error}")
+            return
+        elapsed = (time.perf_counter() - started) * 1000
+        self.log_search_oldest = rows[-1][0] if rows else None
+        more = ", click Older for more" if len(rows) >= LOG_SEARCH_LIMIT else ""
+        self.log_search_info.configure(text=f"{len(rows)} line(s) in {elapsed:.0f} ms{more}")
+        set_textbox(self.log_search_text, "\n".join(format_log_row(row) for row in reversed(rows)))
+
+    def create_diagnostics_tab(self):
+        # Latence REST volání, čtení souborů a callbacků Tk, chyby a propustnost logu
+        frame = ctk.CTkFrame(self.notebook.tab("Diagnostics"), fg_color="#B0B0B0")
+        frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+        self.profiler_var = tk.BooleanVar(value=self.profiler.running)
+        profiler_checkbox = ctk.CTkCheckBox(
+            frame, text="Sampling profiler", variable=self.profiler_var,
+            command=self.toggle_profiler, text_color="#1A1A1A"
+        )
+        profiler_checkbox.grid(row=0, column=0, padx=5, pady=5, sticky="w")
+
+        export_button = ctk.CTkButton(
+            frame, text="Export JSON", command=self.export_diagnostics, fg_color="#1E1E1E", text_color="white"
+        )
+        export_button.grid(row=0, column=1, padx=5, pady=5, sticky="w")
+
+        reset_button = ctk.CTkButton(
+            frame, text="Reset", command=diagnostics.reset, fg_color="#1E1E1E", text_color="white"
+        )
+        reset_button.grid(row=0, column=2, padx=5, pady=5, sticky="w")
+
+        self.diagnostics_text = ctk.CTkTextbox(
+            frame, height=300, width=800, fg_color="white", text_color="black", font=("Courier", 12), wrap="none"
+        )
+        self.diagnostics_text.grid(row=1, column=0, columnspan=3, padx=5, pady=5, sticky="nsew")
+        self.diagnostics_text.configure(state="disabled")  # Zamezení editace
+
+        diagnostics.add_source("ui dispatcher", self.queue.metrics)
+        self.after(DIAGNOSTICS_REFRESH_INTERVAL, self.refresh_diagnostics)
+
+    def refresh_diagnostics(self):
+        # Překresluje se jen viditelná záložka
+        if self.notebook.get() == "Diagnostics":
+            text = format_diagnostics(diagnostics.snapshot())
+            if self.profiler.running or self.profiler.total:
+                text += "\n\nProfiler (top samples):\n" + "\n".join(
+                    f"  {entry['percent']:5.1f}%  {entry['thread']}: {entry['location']}"
+                    for entry in self.profiler.top(15)
+                )
+            set_textbox(self.diagnostics_text, text)
+        self.after(DIAGNOSTICS_REFRESH_INTERVAL, self.refresh_diagnostics)
+
+    def toggle_profiler(self):
+        if self.profiler_var.get():
+            self.profiler.start()
+            self.update_console("Sampling profiler started.")
+        else:
+            self.profiler.stop()
+            self.update_console("Sampling profiler stopped.")
+
+    def export_diagnostics(self):
+        path = filedialog.asksaveasfilename(
+            title="Export diagnostics", defaultextension=".json", filetypes=[("JSON", "*.json")]
+        )
+        if not path:
+            return
+        try:
+            diagnostics.export(path, self.profiler if self.profiler.total else None)
+            self.update_console(f"Diagnostics exported to {path}")
+        except Exception as e:
+            self.update_console(f"Error exporting diagnostics: {e}")
+
+    def create_create_account_tab(self):
+        # Vytvoření záložky Create Account
+        frame = ctk.CTkFrame(self.notebook.tab("Create Account"), fg_color="#B0B0B0")
+        frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+        # Štítek a vstupní pole pro Wallet
+        wallet_label = ctk.CTkLabel(frame, text="Wallet:", text_color="#1A1A1A")
+        wallet_label.grid(row=0, column=0, padx=5, pady=5, sticky="w")
+
+        self.pub_key_entry = ctk.CTkEntry(frame, width=350, fg_color="white", text_color="black")
+        self.pub_key_entry.grid(row=0, column=1, padx=5, pady=5, sticky="w")
+
+        # Štítek a vstupní pole pro Password
+        password_label = ctk.CTkLabel(frame, text="Password:", text_color="#1A1A1A")
+        password_label.grid(row=1, column=0, padx=5, pady=5, sticky="w")
+
+        # Víceřádkové pole pro zadání hesla (skryté výchozí nastavení)
+        self.priv_key_entry = ctk.CTkTextbox(
+            frame, height=100, width=350, fg_color="white", text_color="black", wrap="word"
+        )
+        self.priv_key_entry.grid(row=1, column=1, padx=5, pady=5, sticky="w")
+        self.priv_key_entry.insert("1.0", "*" * 20)  # Výchozí zobrazení jako hvězdičky
+        self.priv_key_entry.configure(state="disabled")  # Zamezení editace pole
+
+        # Výchozí stav - heslo je skryté
+        self.is_password_hidden = True
+        self.original_password = ""  # Uchovává skutečné heslo
+
+        # Tlačítko Show pro zobrazení/skrývání hesla
+        toggle_password_button = ctk.CTkButton(
+            frame,
+            text="Show",
+            command=lambda: self.toggle_password_textbox(toggle_password_button),
+            fg_color="#1E1E1E",
+            text_color="white",
+            width=70
+        )
+        toggle_password_button.grid(row=1, column=2, padx=5, pady=5, sticky="w")
+
+        # Tlačítko pro generování nového účtu
+        fetch_keys_button = ctk.CTkButton(
+            frame, text="Generate New Account", command=self.fetch_keys, fg_color="#1E1E1E", text_color="white"
+        )
+        fetch_keys_button.grid(row=4, column=1, padx=5, pady=10, sticky="w")
+
+        # Tlačítko pro vytvoření záložního souboru
+        backup_button = ctk.CTkButton(
+            frame, text="Create BackUp File", command=self.create_backup_file, fg_color="#1E1E1E", text_color="white"
+        )
+        backup_button.grid(row=4, column=1, padx=5, pady=5, sticky="e")
+
+    # Metoda pro přepínání stavu zobrazení hesla
+    def toggle_password_textbox(self, button):
+        """Přepne mezi zobrazením a skrytím hesla."""
+        if self.is_password_hidden:
+            # Přepnout na zobrazení hesla
+            self.priv_key_entry.configure(state="normal")  # Povolit editaci
+            self.priv_key_entry.delete("1.0", "end")
+            self.priv_key_entry.insert("1.0", self.original_password)
+            self.priv_key_entry.configure(state="disabled")  # Zamezit editaci
+            button.configure(text="Hide")
+        else:
+            # Přepnout na skrytí hesla
+            self.original_password = self.priv_key_entry.get("1.0", "end").strip()  # Uložit skutečné heslo
+            self.priv_key_entry.configure(state="normal")  # Povolit editaci
+            self.priv_key_entry.delete("1.0", "end")
+            self.priv_key_entry.insert("1.0", "*" * len(self.original_password))
+            self.priv_key_entry.configure(state="disabled")  # Zamezit editaci
+            button.configure(text="Show")
+        self.is_password_hidden = not self.is_password_hidden
+
+    def validate_decimal(self, new_value):
+        """
+        Validates that the input is a valid decimal number with up to two decimal places.
+        Only allows a dot (.) as the decimal separator.
+        """
+        if new_value == "" or DECIMAL_PATTERN.match(new_value):
+            return True
+        return False
+
+    def on_tab_change(self):
+        self.ensure_tab(self.notebook.get())
+
+    def ensure_tab(self, name):
+        """Postaví záložku při prvním otevření a doplní do ní odložené výsledky z engine."""
+        if name in self.built_tabs:
+            return
+        self.built_tabs.add(name)
+        with diagnostics.timed("tk", f"build tab {name}"):
+            self.tab_builders[name]()
+        for update_name, tab in UPDATE_TABS.items():
+            if tab == name and update_name in self.deferred_updates:
+                self.on_engine_update(update_name, *self.deferred_updates.pop(update_name))
+
+    def on_engine_update(self, name, value, error):
+        """Zobrazí výsledek z engine (volá se v hlavním vlákně)."""
+        tab = UPDATE_TABS.get(name)
+        if tab is not None and tab not in self.built_tabs:
+            # Záložka ještě není postavená - zobrazí se poslední hodnota, až se otevře
+            self.deferred_updates[name] = (value, error)
+            return
+        handlers = {
+            "local_size": self.show_local_info,
+            "global_size": self.show_global_info,
+            "balances": self.show_balances,
+            "account_file": self.show_miner_account,
+            "nodes": self.set_nodes,
+            "server": self.show_server,
+            "metrics": self.show_metrics,
+            "actions": self.show_actions,
+            "sync": self.show_sync,
+            "autotune": self.show_autotune,
+        }
+        handler = handlers.get(name)
+        if handler is not None:
+            handler(value, error)
+
+    def set_nodes(self, nodes, error=None):
+        """Naplní combobox serverů."""
+        self.host_entry.configure(values=nodes)
+        if nodes and not self.host_entry.get():
+            self.host_entry.set(nodes[0])
+
+    def show_server(self, host, error=None):
+        self.host_entry.set(host)
+
+    def show_metrics(self, snapshot, error):
+        if error:
+            return
+        hashrate = snapshot["gauges"].get("hashrate")
+        set_textbox(self.mining_stats_info, f"Hashrate: {hashrate:.1f} H/s" if hashrate is not None else "Hashrate: N/A")
+        counters = snapshot["counters"]
+        set_textbox(
+            self.blocks_stats_info,
+            f"Blocks found: {counters.get('blocks_found', 0)} / rejected: {counters.get('blocks_rejected', 0)}"
+        )
+
+    def show_actions(self, counts, error=None):
+        self.actions_label.configure(text=f"Actions: {counts['queued']} queued, {counts['running']} running")
+
+    def run_action(self, key, func, *args, callback=None, timeout=None):
+        """Spustí akci v poolu akcí; opakované kliknutí během běhu se ignoruje."""
+        if not self.engine.actions.submit(key, func, *args, callback=callback, timeout=timeout):
+            self.update_console(f"{key} is already in progress.")
+
+    def cancel_actions(self):
+        self.engine.cancel_payout()
+        cancelled = self.engine.actions.cancel_all()
+        self.update_console(f"Cancelled {cancelled} action(s).")
+
+    def report_result(self, success, failure, response, error):
+        # Výsledek akcí vracejících {"error": ...} (volá se v hlavním vlákně)
+        if error:
+            self.update_console(f"Error: {error}")
+        elif "error" in response:
+            self.update_console(f"{failure}: {response['error']}")
+        else:
+            self.update_console(success)
+
+    def probe_servers(self):
+        auto_select = self.auto_server_var.get()
+        self.run_action("Server probe", self.engine.probe_servers, auto_select)
+
+    def toggle_auto_server(self):
+        self.engine.set_auto_server(self.auto_server_var.get())
+
+    def update_blockchain(self):
+        # Spustí aktualizaci v poolu akcí, výsledek se vypíše v hlavním vlákně
+        self.run_action("Blockchain update", self.engine.resolve_blockchain, callback=self.show_blockchain_update)
+
+    def show_blockchain_update(self, message, error):
+        self.update_console(f"Error: {error}" if error else message)
+
+    def show_sync(self, state, error=None):
+        set_textbox(self.sync_info, format_sync_state(state))
+
+    def toggle_autotune(self):
+        self.engine.set_autotune(self.autotune_var.get())
+
+    def show_autotune(self, state, error=None):
+        if state["best"] is not None:
+            self.autotune_info.configure(text=f"Best: {format_tune_result(state['best'])}")
+            self.difficulty_option_menu.set(str(state["best"]["difficulty"]))
+        elif state["results"]:
+            self.autotune_info.configure(text=f"Last: {format_tune_result(state['results'][-1])}")
+
+    def toggle_auto_resolve(self):
+        self.engine.set_auto_resolve(self.auto_resolve_var.get())
+
+    def show_local_info(self, size, error):
+        set_textbox(self.local_info, f"Error: {error}" if error else f"Local Size: {size}")
+
+    def show_global_info(self, size, error):
+        set_textbox(self.global_info, f"Error: {error}" if error else f"Global Size: {size}")
+
+    def refresh_combined_info(self):
+        # Okamžitá aktualizace zůstatků (síťové volání běží v plánovači)
+        self.engine.refresh("balances")
+
+    def show_balances(self, data, error):
+        if error:
+            self.update_console(f"Error refreshing balance: {error}")
+            return
+
+        set_textbox(self.dollar_balance_info, f"{data.get('digitalDollarBalance', 'N/A')}")
+        set_textbox(self.stock_balance_info, f"{data.get('digitalStockBalance', 'N/A')}")
+        set_textbox(self.staking_balance_info, f"{data.get('digitalStakingBalance', 'N/A')}")
+
+    def refresh_miner_account_info(self):
+        self.engine.refresh("account_file")
+
+    def show_miner_account(self, account_info, error):
+        if error:
+            set_textbox(self.miner_account_info, f"Error: {error}")
+            return
+        # Pokud je soubor prázdný, zobrazíme výchozí text
+        set_textbox(self.miner_account_info, account_info or "BUDGET")
+
+    def confirm_wallet_address(self):
+        miner_address = self.wallet_entry.get()
+        if not miner_address:
+            self.update_console("Please enter a valid wallet address.")
+            return
+
+        self.wallet_entry.delete(0, tk.END)
+        self.update_console(f"Sending request to set miner address: {miner_address}")
+        self.run_action("Set wallet", self.engine.set_miner, miner_address, callback=self.show_wallet_result)
+
+    def show_wallet_result(self, response, error):
+        if error:
+            self.update_console(f"Error: {error}")
+        # Zobrazení zvolené peněženky z minerAccount.txt
+        self.engine.refresh("account_file")
+
+    def change_server(self):
+        host = self.host_entry.get()
+        if not host:
+            self.update_console("Please select a valid server.")
+            return
+
+        # Odeslání POST požadavku
+        callback = functools.partial(self.report_result, f"Server changed to: {host}", "Error changing server")
+        self.run_action("Change server", self.engine.change_server, host, callback=callback)
+
+    def confirm_difficulty(self):
+        selected_difficulty = self.difficulty_option_menu.get()
+        # Validace hodnoty obtížnosti
+        if not selected_difficulty.isdigit() or int(selected_difficulty) < 17 or int(selected_difficulty) > 99:
+            self.update_console("Please enter a valid difficulty between 17 and 99.")
+            return
+
+        # Odeslání POST požadavku
+        callback = functools.partial(
+            self.report_result, f"Difficulty set to: {selected_difficulty}", "Error setting difficulty"
+        )
+        self.run_action("Set difficulty", self.engine.set_difficulty, selected_difficulty, callback=callback)
+
+    def start_mining(self):
+        # Spustíme těžbu v poolu akcí
+        callback = functools.partial(self.report_result, "Mining started successfully.", "Error starting mining")
+        self.run_action("Start mining", self.engine.start_mining, callback=callback)
+
+    def stop_mining(self):
+        # Zastavíme těžbu v poolu akcí
+        callback = functools.partial(self.report_result, "Mining stopped successfully.", "Error stopping mining")
+        self.run_action("Stop mining", self.engine.stop_mining, callback=callback)
+
+    def staking_action(self):
+        """
+        Perform staking action by sending POST request to the server.
+        """
+        miner = self.staking_address_entry.get()
+        dollar = self.staking_amount_entry.get()
+        password = self.staking_password_entry.get()
+
+        if not miner or not dollar or not password:
+            self.show_error("All fields must be filled out.")
+            return
+
+        try:
+            dollar = float(dollar)
+            if dollar <= 0:
+                self.show_error("Amount must be greater than 0.")
+                return
+        except ValueError:
+            self.show_error("Amount must be a valid number.")
+            return
+
+        # Připrava dat jako formulářových parametrů
+        data = {
+            "miner": miner,
+            "dollar": str(dollar),  # Server očekává číslo jako string
+            "password": password
+        }
+        self.run_action("Staking", self.engine.staking, data, callback=self.report_response)
+
+    def unstaking_action(self):
+        """
+        Perform unstaking action by sending POST request to the server.
+        """
+        miner = self.staking_address_entry.get()
+        dollar = self.staking_amount_entry.get()
+        password = self.staking_password_entry.get()
+
+        if not miner or not dollar or not password:
+            self.show_error("All fields must be filled out.")
+            return
+
+        try:
+            dollar = float(dollar)
+            if dollar <= 0:
+                self.show_error("Amount must be greater than 0.")
+                return
+        except ValueError:
+            self.show_error("Amount must be a valid number.")
+            return
+
+        # Připrava dat jako formulářových parametrů
+        data = {
+            "miner": miner,
+            "dollar": str(dollar),
+            "password": password
+        }
+        self.run_action("Unstaking", self.engine.unstaking, data, callback=self.report_response)
+
+    def show_message(self, message):
+        print(f"INFO: {message}")
+
+    def show_error(self, error):
+        print(f"ERROR: {error}")
+
+    def fetch_keys(self):
+        """Metoda pro generování nového účtu."""
+        self.run_action("Generate account", self.engine.fetch_keys, callback=self.show_keys)
+
+    def show_keys(self, response, error):
+        if error:
+            self.update_console(f"Error fetching keys: {error}")
+            return
+        try:
+            if response.status_code == 200:
+                keys_data = response.json()
+                pub_key = keys_data.get("pubKey", "")
+                priv_key = keys_data.get("privKey", "")
+
+                # Aktualizace hodnot v GUI
+                self.pub_key_entry.delete(0, "end")  # Vymaže obsah pole Wallet
+                self.pub_key_entry.insert(0, pub_key)  # Vloží novou hodnotu do Wallet
+
+                # Uložení a zobrazení hesla
+                self.original_password = priv_key
+                self.priv_key_entry.configure(state="normal")  # Povolit změnu
+                self.priv_key_entry.delete("1.0", "end")  # Vymazání pole
+                self.priv_key_entry.insert("1.0", "*" * len(priv_key))  # Zobrazení hesla jako hvězdičky
+                self.priv_key_entry.configure(state="disabled")  # Zamezení editace
+                self.is_password_hidden = True  # Heslo je skryté
+            else:
+                self.update_console(f"Error fetching keys: Status code {response.status_code}")
+        except Exception as e:
+            self.update_console(f"Error fetching keys: {str(e)}")
+
+    def create_backup_file(self):
+        pub_key = self.pub_key_entry.get()
+        priv_key = self.priv_key_entry.get()
+        if not pub_key or not priv_key:
+            self.update_console("Both wallet and password must be provided to create a backup file.")
+            return
+
+        backup_filename = f"{pub_key}.txt"
+        backup_filepath = os.path.join(os.getcwd(), backup_filename)
+
+        try:
+            with open(backup_filepath, 'w') as backup_file:
+                backup_file.write(f"Backup for wallet: {pub_key}\n")
+                backup_file.write(f"Public Key: {pub_key}\n")
+                backup_file.write(f"Private Key: {priv_key}\n")
+            self.update_console(f"Backup file created: {backup_filepath}")
+        except Exception as e:
+            self.update_console(f"Error creating backup file: {str(e)}")
+
+    def validate_decimal(self, new_value):
+        """
+        Validates that the input is a valid decimal number with up to two decimal places.
+        """
+        # Povolí prázdný vstup (pro mazání) nebo čísla s tečkou jako desetinným oddělovačem
+        if new_value == "" or DECIMAL_PATTERN.match(new_value):
+            return True
+        return False
+
+    def toggle_password(self, entry):
+        """
+        Toggles the visibility of the password field.
+        """
+        if entry.cget('show') == "*":
+            entry.configure(show="")  # Zobrazení textu
+        else:
+            entry.configure(show="*")  # Skrytí textu
+
+    def send_coin(self):
+        sender = self.entries['sender'].get()
+        recipient = self.entries['recipient'].get()
+        dollar = self.entries['dollar'].get()
+        stock = self.entries['stock'].get()
+        reward = self.entries['reward'].get()
+        password = self.entries['password'].get()
+
+        # Ověření vstupů
+        if not sender or not recipient or not dollar or not stock or not reward or not password:
+            self.update_console("All fields must be filled out.")
+            return
+
+        try:
+            # Kontrola číselných hodnot
+            dollar = float(dollar)
+            stock = float(stock)
+            reward = float(reward)
+
+            if dollar <= 0 or stock < 0 or reward < 0:
+                self.update_console("Dollar must be greater than 0, and stock/reward must be non-negative.")
+                return
+        except ValueError:
+            self.update_console("Dollar, stock, and reward must be numeric values.")
+            return
+
+        # Výpis odesílaného požadavku
+        url = self.engine.send_coin_url(sender, recipient, dollar, stock, reward)
+        self.update_console(f"Sending request: {url}")
+
+        # Odeslání GET požadavku v poolu akcí
+        args = (sender, recipient, dollar, stock, reward, password)
+        callback = functools.partial(self.report_response, show_body=True)
+        self.run_action("Send coins", self.engine.send_coin, *args, callback=callback)
+
+    def batch_payout(self):
+        sender = self.entries['sender'].get()
+        password = self.entries['password'].get()
+        if not sender or not password:
+            self.update_console("Sender and password must be filled out for a batch payout.")
+            return
+
+        path = filedialog.askopenfilename(
+            title="Payout file", filetypes=[("CSV or JSON", "*.csv *.json"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        if self.engine.payout is not None:
+            self.update_console("A batch payout is already running; cancel it or wait until it finishes.")
+            return
+        self.update_console(f"Starting batch payout from {path}")
+        self.engine.start_payout(path, sender, password, self.show_payout_result)
+
+    def show_payout_result(self, summary, error):
+        self.update_console(f"Error running payout: {error}" if error else f"Batch payout done: {summary}")
+
+    def report_response(self, response, error, show_body=False):
+        """
+        Vypíše výsledek HTTP požadavku odeslaného v poolu akcí (volá se v hlavním vlákně).
+        """
+        if error:
+            self.update_console(f"Error: {redact_password(str(error))}")
+            return
+        try:
+            if response.status_code == 200:
+                self.update_console("Request successful.")
+                if show_body:
+                    self.update_console(f"Response: {response.json()}")
+            else:
+                self.update_console(f"Request failed with status code: {response.status_code}")
+                if show_body:
+                    self.update_console(f"Response: {response.text}")
+        except Exception as e:
+            self.update_console(f"Error: {str(e)}")
+
+    def prompt_jar_restart(self, version, jar_path):
+        if messagebox.askyesno("Update available", f"Miner version {version} was downloaded. Restart the miner now?"):
+            self.run_action("Miner restart", self.engine.restart_java_jar, jar_path)
+        else:
+            self.update_console(f"Version {version} will be used on the next start.")
+
+    def apply_jvm_profile(self):
+        name = self.jvm_profile_menu.get()
+        try:
+            self.jvm_profiles.set_active(name)
+        except Exception as e:
+            self.update_console(f"Error saving JVM profile: {e}")
+            return
+        self.update_console(f"JVM profile '{name}' selected for {self.jvm_profiles.machine}.")
+        if self.engine.jar_path and messagebox.askyesno("JVM profile", "Restart the miner now to apply the profile?"):
+            self.run_action("Miner restart", self.engine.restart_java_jar)
+
+    def on_close(self):
+        """
+        Ukončí proces Java a GUI aplikaci při zavření hlavního okna.
+        """
+        self.profiler.stop()
+        self.engine.shutdown()
+        self.console_buffer.close()
+        self.destroy()  # Zavře GUI aplikaci
+
+    def update_console(self, message):
+        """Bezpečná aktualizace konzole, zarovnání zpráv pod sebou."""
+        self.console_buffer.write(message)
+